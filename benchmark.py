@@ -0,0 +1,206 @@
+#
+# Benchmarks for my Graph Library implementation in Python
+#
+# How to run: `python benchmark.py`
+#
+#   --sizes 1000 10000      number of edges of the generated graphs (default 10^3 to 10^6)
+#   --generators grid chain any of erdos-renyi, grid, power-law and chain (default all)
+#   --output results.json   where the results are written (default benchmark.json)
+#   --baseline old.json     compare with an earlier output and flag regressions
+#   --tolerance 0.25        allowed slowdown/memory growth before a result counts as regression
+#   --min-seconds 0.005     smaller slowdowns never count as regression (timer noise)
+#   --min-bytes 65536       smaller memory growth never counts as regression
+#   --repeat 5              number of timed samples per operation, the fastest one is reported
+#                           fast operations run several times per sample so that a sample takes at least 0.2s
+#   --no-memory             skip the (slower) peak memory runs
+#
+# Every operation is timed without tracing, the peak memory is measured in an extra run with tracemalloc.
+# The exit code is 1 if a regression against the baseline was found.
+#
+
+import argparse
+import json
+import math
+import platform
+import random
+import sys
+import timeit
+import tracemalloc
+
+from gpl import Base
+
+REPRESENTATIONS = (Base.Graph.EDGE, Base.Graph.NEIGHBOUR)
+SEED = 4711
+
+#
+# Graph generators, all return (number of nodes, list of (node index, node index, weight) tuples)
+#
+
+#G(n, m) random graph with about 4 edges per node
+#small graphs get enough nodes for numEdges distinct pairs
+def erdosRenyi(numEdges, rnd):
+    numNodes = max(2, numEdges // 4)
+    while numNodes * (numNodes - 1) // 2 < numEdges:
+        numNodes += 1
+    edges = set()
+    while len(edges) < numEdges:
+        m, n = rnd.randrange(numNodes), rnd.randrange(numNodes)
+        if m != n:
+            edges.add((min(m, n), max(m, n)))
+    return numNodes, [(m, n, rnd.randint(1, 100)) for m, n in sorted(edges)]
+
+#square 2D grid with about numEdges edges
+def grid(numEdges, rnd):
+    side = max(2, int(math.sqrt(numEdges / 2)) + 1)
+    edges = []
+    for row in range(side):
+        for column in range(side):
+            node = row * side + column
+            if column + 1 < side:
+                edges.append((node, node + 1, rnd.randint(1, 100)))
+            if row + 1 < side:
+                edges.append((node, node + side, rnd.randint(1, 100)))
+    return side * side, edges[:numEdges]
+
+#preferential attachment (Barabasi-Albert), every new node links to 3 existing nodes
+def powerLaw(numEdges, rnd):
+    links = 3
+    numNodes = max(links + 1, numEdges // links + 1)
+    targets = list(range(links))
+    endpoints = []
+    edges = []
+    for node in range(links, numNodes):
+        for target in set(targets):
+            edges.append((target, node, rnd.randint(1, 100)))
+            endpoints.extend((target, node))
+        targets = [rnd.choice(endpoints) for i in range(links)]
+    return numNodes, edges[:numEdges]
+
+#a single path, the worst case for traversal depth
+def chain(numEdges, rnd):
+    return numEdges + 1, [(node, node + 1, rnd.randint(1, 100)) for node in range(numEdges)]
+
+GENERATORS = {
+    "erdos-renyi": erdosRenyi,
+    "grid": grid,
+    "power-law": powerLaw,
+    "chain": chain,
+}
+
+#
+# Benchmark runner
+#
+
+#builds an undirected MST graph or a directed SSSP graph with add
+#every graph gets its own nodes, in neighbour representation the nodes store the adjacency
+def build(numNodes, edges, representation, directed):
+    nodes = [Base.Node() for i in range(numNodes)]
+    if directed:
+        G = Base.Graph(directed = True, weighted = True, SSSP = True, representation = representation, traversal = Base.Graph.BFS)
+    else:
+        G = Base.Graph(weighted = True, MST = True, representation = representation, traversal = Base.Graph.BFS)
+    for m, n, weight in edges:
+        G.add(nodes[m], nodes[n], weight)
+    return G
+
+#returns the operations to benchmark as (name, function) tuples
+def operations(numNodes, edges, representation, undirected, directed):
+    rnd = random.Random(SEED)
+    #both graphs were built from the same edges, so node IDs (and the pairs) correspond
+    pairs = [(rnd.randrange(undirected.size()), rnd.randrange(undirected.size())) for i in range(10)]
+
+    def search():
+        for m, n in pairs:
+            undirected.search(undirected.nodes()[m], undirected.nodes()[n])
+            directed.search(directed.nodes()[m], directed.nodes()[n])
+
+    return [
+        ("addUndirected", lambda: build(numNodes, edges, representation, False)),
+        ("addDirected", lambda: build(numNodes, edges, representation, True)),
+        ("search", search),
+        ("SSSP", lambda: directed.SSSP(directed.nodes()[0])),
+        ("MST", lambda: undirected.MST()),
+        ("edges", lambda: undirected.edges()),
+        ("DOTprint", lambda: undirected.DOTprint()),
+    ]
+
+#returns the seconds per call of the fastest of repeat samples (the one least disturbed by other processes),
+#the number of calls per sample and the peak memory
+#timeit.autorange picks the calls per sample (1, 2, 5, 10, ...) so that a sample takes at least 0.2s,
+#timeit turns the garbage collector off while timing
+def measure(function, memory, repeat):
+    timer = timeit.Timer(function)
+    loops, elapsed = timer.autorange()
+    seconds = min([elapsed] + timer.repeat(repeat - 1, loops)) / loops
+    peak = None
+    if memory:
+        tracemalloc.start()
+        function()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return seconds, loops, peak
+
+def run(sizes, generators, memory, repeat):
+    results = []
+    for name in generators:
+        for size in sizes:
+            numNodes, edges = GENERATORS[name](size, random.Random(SEED))
+            for representation in REPRESENTATIONS:
+                undirected = build(numNodes, edges, representation, False)
+                directed = build(numNodes, edges, representation, True)
+                for operation, function in operations(numNodes, edges, representation, undirected, directed):
+                    seconds, loops, peak = measure(function, memory, repeat)
+                    results.append({"generator": name, "edges": len(edges), "nodes": numNodes,
+                                    "representation": representation, "operation": operation,
+                                    "seconds": seconds, "loops": loops, "peakBytes": peak})
+                    print("%-12s %8d %-10s %-13s %10.4fs %12s" % (name, len(edges), representation, operation, seconds,
+                                                                     "-" if peak is None else "%d B" % peak))
+    return results
+
+#returns a list of messages for results that are slower or bigger than in the baseline
+#by more than tolerance (relative) and minimum (absolute, per metric)
+def regressions(results, baseline, tolerance, minimum):
+    def key(result):
+        return (result["generator"], result["edges"], result["representation"], result["operation"])
+
+    old = {key(result): result for result in baseline["results"]}
+    messages = []
+    for result in results:
+        if key(result) not in old: continue
+        for metric in ("seconds", "peakBytes"):
+            before, now = old[key(result)][metric], result[metric]
+            if before is None or now is None: continue
+            if now > before * (1 + tolerance) and now - before > minimum[metric]:
+                messages.append("%s %d %s %s: %s %.4g -> %.4g" % (key(result) + (metric, before, now)))
+    return messages
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(description = "Benchmarks for the graph library")
+    parser.add_argument("--sizes", type = int, nargs = "+", default = [10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6])
+    parser.add_argument("--generators", nargs = "+", choices = sorted(GENERATORS), default = list(GENERATORS))
+    parser.add_argument("--output", default = "benchmark.json")
+    parser.add_argument("--baseline")
+    parser.add_argument("--tolerance", type = float, default = 0.25)
+    parser.add_argument("--min-seconds", dest = "minSeconds", type = float, default = 0.005)
+    parser.add_argument("--min-bytes", dest = "minBytes", type = int, default = 65536)
+    parser.add_argument("--repeat", type = int, default = 5)
+    parser.add_argument("--no-memory", dest = "memory", action = "store_false")
+    args = parser.parse_args(argv)
+
+    results = run(args.sizes, args.generators, args.memory, max(1, args.repeat))
+    with open(args.output, "w") as f:
+        json.dump({"python": platform.python_version(), "platform": platform.platform(), "seed": SEED,
+                   "repeat": max(1, args.repeat), "results": results}, f, indent = 1)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            messages = regressions(results, json.load(f), args.tolerance,
+                                   {"seconds": args.minSeconds, "peakBytes": args.minBytes})
+        for message in messages:
+            print("REGRESSION " + message)
+        if messages:
+            return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -8,13 +8,32 @@
 #
 # Prerequisites
 #
+# NumPy is optional, it is only needed for NumPy results (e.g. SSSPMany(..., matrix = True)),
+# adjacencyMatrix, levels and the FRONTIER traversal
+#
 
 
 import unittest
-import queue
+from concurrent.futures import ProcessPoolExecutor
+from collections import deque, OrderedDict
 from operator import methodcaller
-import copy
 import math
+import heapq
+from array import array
+from bisect import bisect_right
+import gzip
+import io
+import os
+import struct
+import sys
+import tempfile
+import time
+from mmap import mmap as memoryMap, ACCESS_READ
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 class Base():
   #
@@ -22,7 +41,10 @@ class Base():
   # ---------------%<------------------
 
   
+    #all node, neighbour and edge classes use __slots__ (no per-instance __dict__)
     class Node:
+        __slots__ = ('_neighbours',)
+
         def __init__(self):
             self._neighbours = []
             
@@ -34,8 +56,87 @@ class Base():
             
         def addNeighbours(self, neighbours):
             self._neighbours.extend(neighbours)
-            
+
+        def removeNeighbours(self):
+            self._neighbours = []
+
+    #Node that keeps its neighbours as parallel growable buffers (opposite nodes and an array of weights)
+    #instead of a list of Neighbour objects, neighbours() creates the Neighbour objects on every call
+    #so they are not identical between calls (e.g. adding an existing edge twice returns two different objects)
+    #Graph reads the buffers directly through opposites(), weightedOpposites() and neighbour() without creating them
+    #
+    #memory per stored neighbour (CPython 3.11, 64 bit, measured with tracemalloc):
+    #  Node:        8 byte list slot + 40 byte Neighbour = 48 bytes
+    #               weighted: 8 byte list slot + 48 byte WeightedNeighbour + weight object (24-32 bytes) = ~88 bytes
+    #  CompactNode: 8 byte list slot = 8 bytes, weighted: + 8 byte array entry = 16 bytes
+    #               (mixed int/float weights or weights outside of int64 use a list: + 8 byte slot + weight object)
+    #an undirected edge stores two neighbours, every node adds ~60 bytes for its list (and weight array)
+    class CompactNode(Node):
+        __slots__ = ('_opposites', '_weights')
+
+        def __init__(self):
+            self._opposites = []
+            self._weights = None
+
+        def neighbours(self):
+            if self._weights is None:
+                return [Base.Neighbour(opposite) for opposite in self._opposites]
+            return [Base.WeightedNeighbour(opposite, weight) for opposite, weight in zip(self._opposites, self._weights)]
+
+        #returns the opposite nodes of all neighbours
+        def opposites(self):
+            return list(self._opposites)
+
+        #returns (opposite, weight) pairs of all neighbours, the weight is None without weights
+        def weightedOpposites(self):
+            if self._weights is None:
+                return [(opposite, None) for opposite in self._opposites]
+            return list(zip(self._opposites, self._weights))
+
+        def degree(self):
+            return len(self._opposites)
+
+        #returns a new Neighbour object for the first neighbour with the given opposite, None if there is none
+        def neighbour(self, opposite):
+            for i, node in enumerate(self._opposites):
+                if node is opposite:
+                    if self._weights is None:
+                        return Base.Neighbour(node)
+                    return Base.WeightedNeighbour(node, self._weights[i])
+            return None
+
+        def addNeighbour(self, neighbour):
+            if isinstance(neighbour, Base.WeightedNeighbour):
+                weight = neighbour.weight()
+                typecode = Base.CompactNode._typecode(weight)
+                if self._weights is None:
+                    self._weights = array(typecode) if typecode is not None else []
+                #weights that do not fit the array keep all weights as the original objects, so ints stay ints
+                elif isinstance(self._weights, array) and self._weights.typecode != typecode:
+                    self._weights = list(self._weights)
+                self._weights.append(weight)
+            self._opposites.append(neighbour.opposite())
+
+        #returns the array typecode that stores weight without changing it ('q' for int64, 'd' for float), None if there is none
+        @staticmethod
+        def _typecode(weight):
+            if type(weight) is int and -2 ** 63 <= weight < 2 ** 63:
+                return 'q'
+            if type(weight) is float:
+                return 'd'
+            return None
+
+        def addNeighbours(self, neighbours):
+            for neighbour in neighbours:
+                self.addNeighbour(neighbour)
+
+        def removeNeighbours(self):
+            self._opposites = []
+            self._weights = None
+
     class Neighbour:
+        __slots__ = ('_opposite',)
+
         def __init__(self, opposite):
             self._opposite = opposite
             
@@ -43,6 +144,8 @@ class Base():
             return self._opposite
         
     class WeightedNeighbour(Neighbour):
+        __slots__ = ('_weight',)
+
         def __init__(self, opposite, weight):
             super().__init__(opposite)
             self._weight = weight                  
@@ -50,7 +153,10 @@ class Base():
         def weight(self):
             return self._weight
         
+    #memory per edge object (CPython 3.11, 64 bit): 48 bytes, weighted: 56 bytes + weight object
     class Edge:
+        __slots__ = ('_node1', '_node2')
+
         def __init__(self, node1, node2):
             self._node1 = node1
             self._node2 = node2
@@ -61,6 +167,8 @@ class Base():
             return self._node2
         
     class WeightedEdge(Edge):
+        __slots__ = ('_weight',)
+
         def __init__(self, node1, node2, weight):
             super().__init__(node1, node2)
             self._weight = weight
@@ -71,12 +179,92 @@ class Base():
     class GraphException(Exception):
         pass
 
+    #disjoint-set forest with union by rank and path compression
+    class DisjointSet():
+        def __init__(self):
+            self._parent = dict()
+            self._rank = dict()
+            self._count = 0
+
+        #adds item as a new singleton set
+        def makeSet(self, item):
+            self._parent[item] = item
+            self._rank[item] = 0
+            self._count += 1
+
+        #returns the representative of the set containing item
+        def find(self, item):
+            parent = self._parent
+            root = item
+            while parent[root] != root:
+                root = parent[root]
+            #path compression
+            while parent[item] != root:
+                parent[item], item = root, parent[item]
+            return root
+
+        #merges the sets of item1 and item2, returns False if they were in the same set already
+        def union(self, item1, item2):
+            root1 = self.find(item1)
+            root2 = self.find(item2)
+
+            if root1 == root2:
+                return False
+
+            if self._rank[root1] < self._rank[root2]:
+                self._parent[root1] = root2
+            elif self._rank[root1] > self._rank[root2]:
+                self._parent[root2] = root1
+            else:
+                self._parent[root2] = root1
+                self._rank[root1] += 1
+            self._count -= 1
+            return True
+
+        #returns the number of disjoint sets
+        def count(self):
+            return self._count
+
+    #observer that sums up what a graph reports: number of calls, seconds and counters per operation
+    #use it with Graph.setObserver(stats), any callable(operation, counters, seconds) works as observer too
+    class Stats():
+        def __init__(self):
+            self._calls = dict()
+            self._seconds = dict()
+            self._counters = dict()
+
+        def record(self, operation, counters, seconds):
+            self._calls[operation] = self._calls.get(operation, 0) + 1
+            self._seconds[operation] = self._seconds.get(operation, 0) + seconds
+            totals = self._counters.setdefault(operation, dict())
+            for name, value in counters.items():
+                totals[name] = totals.get(name, 0) + value
+
+        #returns the names of all recorded operations
+        def operations(self):
+            return list(self._calls)
+
+        def calls(self, operation):
+            return self._calls.get(operation, 0)
+
+        def seconds(self, operation):
+            return self._seconds.get(operation, 0)
+
+        #returns the summed counters of operation
+        def counters(self, operation):
+            return dict(self._counters.get(operation, dict()))
+
+        def reset(self):
+            self._calls.clear()
+            self._seconds.clear()
+            self._counters.clear()
+
     #Manages the apropriate data structure (queue and stack) for BFS/DFS graph traversal
     class TraversalStore():
         def __init__(self, traversalMode):
             if traversalMode == Base.Graph.BFS:
                 self._traversal = Base.Graph.BFS
-                self._queue = queue.Queue()
+                self._queue = deque()
             elif traversalMode == Base.Graph.DFS:
                 self._traversal = Base.Graph.DFS
                 self._stack = []
@@ -89,21 +277,21 @@ class Base():
         #add an item to the store
         def add(self, item):
             if self._traversal == Base.Graph.BFS:
-                self._queue.put(item)
+                self._queue.append(item)
             elif self._traversal == Base.Graph.DFS:
                 self._stack.append(item)
 
         #gets and removes the item from the store
         def get(self):
             if self._traversal == Base.Graph.BFS:
-                return self._queue.get()
+                return self._queue.popleft()
             elif self._traversal == Base.Graph.DFS:
                 return self._stack.pop()
 
         #checks wether store is empty
         def empty(self):
             if self._traversal == Base.Graph.BFS:
-                return self._queue.empty()
+                return len(self._queue) == 0
             elif self._traversal == Base.Graph.DFS:
                 if len(self._stack) == 0:
                     return True
@@ -112,11 +300,7 @@ class Base():
         #returns a list of all items in the stack
         def all(self):
             if self._traversal == Base.Graph.BFS:
-                cp = copy.copy(self._queue)
-                lst = list()
-                while not cp.empty():
-                    lst.append(cp.get())
-                return lst
+                return list(self._queue)
             else:
                 return list(self._stack)
 
@@ -124,14 +308,36 @@ class Base():
         # "Constants"
         NEIGHBOUR = "neighbour"
         EDGE = "edge"
+        CSR = "csr"
         BFS = "bfs"
         DFS = "dfs"
+        BIDIRECTIONAL = "bidirectional"
+        FRONTIER = "frontier"
 
-        def __init__(self, directed: bool = False, representation = None, weighted: bool = False, printable: bool = True, traversal = None, MST: bool = False, SSSP: bool = False):
+        def __init__(self, directed: bool = False, representation = None, weighted: bool = False, printable: bool = True, traversal = None, MST: bool = False, SSSP: bool = False, components: bool = False, SCC: bool = False, incrementalMST: bool = False, SSSPCache: int = 0):
             #Edge representation is the default
-            if (representation == None) or (representation != Base.Graph.NEIGHBOUR):
+            if representation == Base.Graph.CSR:
+                #compressed sparse row representation (read-only, see freeze)
+                #the neighbours of the node with ID i are _targets[_offsets[i]:_offsets[i+1]] (node IDs)
+                #_weights runs parallel to _targets and is None for unweighted graphs
+                #memory per edge: 8 bytes (target) + 8 bytes (weight), plus 8 bytes per node (offset)
+                self._representation = Base.Graph.CSR
+                self._offsets = array('q', [0])
+                self._targets = array('q')
+                self._weights = None
+                #None, or for double weights that came from a mix of ints and floats a byte per weight (1: was an int)
+                self._intWeights = None
+                self._numEdges = 0
+                #lazily built (offsets, sources) of the incoming edges in digraphs
+                self._reverseCSR = None
+            elif (representation == None) or (representation != Base.Graph.NEIGHBOUR):
                 self._representation = Base.Graph.EDGE
                 self._edges = []
+                #maps (node1, node2) to the internal edge object, undirected edges are stored under both directions
+                self._edgeIndex = dict()
+                #maps each node to a list of (neighbour, edge) pairs, for digraphs _inAdjacency holds the incoming edges
+                self._adjacency = dict()
+                self._inAdjacency = dict()
             else:
                 self._representation = representation
             
@@ -144,6 +350,12 @@ class Base():
                 self._traversal = Base.Graph.BFS
             elif traversal == Base.Graph.DFS:
                 self._traversal = Base.Graph.DFS
+            elif traversal == Base.Graph.BIDIRECTIONAL:
+                self._traversal = Base.Graph.BIDIRECTIONAL
+            elif traversal == Base.Graph.FRONTIER:
+                if np is None:
+                    raise Base.GraphException('NumPy is required for frontier traversal!')
+                self._traversal = Base.Graph.FRONTIER
             else:
                 self._traversal = None
 
@@ -154,7 +366,20 @@ class Base():
                 self._MST = True
             else:
                 self._MST = False
-            self._nodes = []                    
+            #default is False, the tree is computed by the first call of MST and then maintained by add
+            if incrementalMST == True and not self._MST:
+                raise Base.GraphException('Incremental MST needs MST = True!')
+            self._incrementalMST = incrementalMST == True
+            #maintained spanning forest: node -> (neighbour -> weight), None until it is computed
+            self._mstTree = None
+            #the same forest rooted: node -> parent (None for roots) and node -> depth, for path queries
+            self._mstParent = None
+            self._mstDepth = None
+            #node registry: _nodes maps ID -> node (in insertion order), _nodeIDs maps node -> ID
+            self._nodes = []
+            self._nodeIDs = dict()
+            #lazily built predecessor lists for directed graphs in neighbour representation
+            self._reverseIndex = None
             #defazlt uis False
             if SSSP == True:
                 if not self._weighted or not self._directed:
@@ -162,32 +387,105 @@ class Base():
                 self._SSSP = True
             else:
                 self._SSSP = False
+            #default is 0 (off), keeps the shortest path trees of up to SSSPCache sources and repairs them in add
+            if SSSPCache > 0:
+                if not self._SSSP:
+                    raise Base.GraphException('SSSP cache needs SSSP = True!')
+                self._ssspTrees = OrderedDict()
+            else:
+                self._ssspTrees = None
+            self._SSSPCache = SSSPCache
+            #lazily built NumPy (indptr, indices, data) adjacency matrix (see adjacencyMatrix)
+            self._adjacencyMatrix = None
+            #instrumentation is off by default (see setObserver)
+            self._observer = None
+            self._report = None
+            #default is False, the components index is maintained by add
+            if components == True:
+                if self._directed:
+                    raise Base.GraphException('Components index only available for undirected graphs!')
+                self._componentIndex = Base.DisjointSet()
+            else:
+                self._componentIndex = None
+            #default is False, the condensation index is built lazily by search and dropped by add
+            if SCC == True:
+                if not self._directed:
+                    raise Base.GraphException('SCC index only available for directed graphs!')
+                self._SCC = True
+            else:
+                self._SCC = False
+            self._sccIndex = None
+            #transitive closure, one bitset per strongly connected component (see buildReachability)
+            self._reachability = None
         
         def nodeID(self, node):
-            return self._nodes.index(node)
+            if node not in self._nodeIDs:
+                raise ValueError('Node not in graph!')
+            return self._nodeIDs[node]
+
+        #checks wether node is part of the graph
+        def hasNode(self, node):
+            return node in self._nodeIDs
         
         def edges(self):
             if self._representation == Base.Graph.EDGE:
                 return self._edges
             elif self._representation == Base.Graph.NEIGHBOUR:
                 edges = list()
-                visited = list()    
-                for node in self._nodes:
+                for nodeID, node in enumerate(self._nodes):
+                    selfLoops = 0
                     for neighbour in node.neighbours():
-                        if neighbour.opposite() in visited: continue
+                        #undirected edges are returned once, from the node that was added first
+                        if not self._directed:
+                            if self._nodeIDs[neighbour.opposite()] < nodeID: continue
+                            #undirected self loops are stored twice, skip the mirrored entry
+                            if neighbour.opposite() is node:
+                                selfLoops += 1
+                                if selfLoops % 2 == 0: continue
                         if self._weighted:
                             newEdge = Base.WeightedEdge(node, neighbour.opposite(), neighbour.weight())
                         else:
                             newEdge = Base.Edge(node, neighbour.opposite())
                         edges.append(newEdge)
-                        if not self._directed: visited.append(node)
+                return edges
+            elif self._representation == Base.Graph.CSR:
+                edges = list()
+                for nodeID, node in enumerate(self._nodes):
+                    selfLoops = 0
+                    for i in range(self._offsets[nodeID], self._offsets[nodeID + 1]):
+                        targetID = self._targets[i]
+                        #undirected edges are stored in both rows, only return them once
+                        if not self._directed:
+                            if targetID < nodeID: continue
+                            if targetID == nodeID:
+                                selfLoops += 1
+                                if selfLoops % 2 == 0: continue
+                        if self._weighted:
+                            edges.append(Base.WeightedEdge(node, self._nodes[targetID], self._csrWeight(i)))
+                        else:
+                            edges.append(Base.Edge(node, self._nodes[targetID]))
                 return edges
 
         #returns an edge object (the internal object if the graph-representatio is an edge-list) between node1 and node2, None if it does not exist
         def edge(self, node1, node2):
-            if node1 not in self._nodes or node2 not in self._nodes:
+            if self._report is None:
+                return self._edge(node1, node2)
+            start = time.perf_counter()
+            edge = self._edge(node1, node2)
+            self._report('edge', {'found': int(edge is not None)}, time.perf_counter() - start)
+            return edge
+
+        def _edge(self, node1, node2):
+            if node1 not in self._nodeIDs or node2 not in self._nodeIDs:
                 return None
             if self._representation == Base.Graph.NEIGHBOUR:
+                if isinstance(node1, Base.CompactNode):
+                    neighbour = node1.neighbour(node2)
+                    if neighbour is None:
+                        return None
+                    if self._weighted:
+                        return Base.WeightedEdge(node1, node2, neighbour.weight())
+                    return Base.Edge(node1, node2)
                 for neighbour in node1.neighbours():
                     if neighbour.opposite() is node2:
                         if self._weighted:
@@ -196,16 +494,26 @@ class Base():
                             return Base.Edge(node1, neighbour.opposite())
                 return None
             elif self._representation == Base.Graph.EDGE:
-                for edge in self._edges:
-                    if edge.node1() is node1 and edge.node2() is node2:
-                        return edge
-                    if not self._directed:
-                        if edge.node1() is node2 and edge.node2() is node1:
-                            return edge
+                return self._edgeIndex.get((node1, node2))
+            elif self._representation == Base.Graph.CSR:
+                nodeID = self._nodeIDs[node1]
+                targetID = self._nodeIDs[node2]
+                for i in range(self._offsets[nodeID], self._offsets[nodeID + 1]):
+                    if self._targets[i] == targetID:
+                        if self._weighted:
+                            return Base.WeightedEdge(node1, node2, self._csrWeight(i))
+                        else:
+                            return Base.Edge(node1, node2)
                 return None
             else:
                 raise Base.GraphException('Unknown representation!')
 
+        #checks wether there is an edge between node1 and node2 (from node1 to node2 in digraphs)
+        def hasEdge(self, node1, node2):
+            if self._representation == Base.Graph.EDGE:
+                return (node1, node2) in self._edgeIndex
+            return self._edge(node1, node2) is not None
+
 
         def nodes(self):
             return self._nodes
@@ -225,11 +533,32 @@ class Base():
         def traversal(self):
             return self._traversal
 
+        def observer(self):
+            return self._observer
+
+        #sets an observer that gets the counters and the duration of every search, SSSP, distances, SSSPMany, MST,
+        #addEdges, getNeighbourhood and edge call, either a Base.Stats object or a callable(operation, counters, seconds)
+        #None turns instrumentation off again, then only a single None check per call remains
+        def setObserver(self, observer):
+            self._observer = observer
+            if observer is None:
+                self._report = None
+            elif hasattr(observer, "record"):
+                self._report = observer.record
+            else:
+                self._report = observer
+
         def setTraversal(self, traversalMode):
             if traversalMode == Base.Graph.DFS:
                 self._traversal = Base.Graph.DFS
             elif traversalMode == Base.Graph.BFS:
                 self._traversal= Base.Graph.BFS
+            elif traversalMode == Base.Graph.BIDIRECTIONAL:
+                self._traversal = Base.Graph.BIDIRECTIONAL
+            elif traversalMode == Base.Graph.FRONTIER:
+                if np is None:
+                    raise Base.GraphException('NumPy is required for frontier traversal!')
+                self._traversal = Base.Graph.FRONTIER
             else:
                 self._traversal = None
 
@@ -237,6 +566,8 @@ class Base():
         #in digraphs the direction is from m to n
         #positive weights are expected for weighted graphs
         def add(self, m, n, weight = None):
+            if self._representation == Base.Graph.CSR:
+                raise Base.GraphException('CSR graphs are read-only!')
             if self._weighted == True:
                 if weight == None or weight < 0:
                     raise Base.GraphException('Expected non-negative weight')
@@ -244,22 +575,89 @@ class Base():
             if self._representation == Base.Graph.NEIGHBOUR:
                 return self._addNeighbourEdge(m, n, weight)
             # check if edge already exists
-            for edge in self._edges:
-                if edge.node1() is m and edge.node2() is n:
-                    return edge
-                if not self._directed:
-                    if edge.node1() is n and edge.node2() is m:
-                        return edge
-                
-            #add the new edge
+            e = self._edgeIndex.get((m, n))
+            if e is not None:
+                return e
+            return self._insertEdge(m, n, weight)
+
+        #adds all edges of an iterable of (m, n) or (m, n, weight) tuples (e.g. a generator) in a single pass
+        #edges that already exist in the graph or earlier in the batch are skipped
+        #trusted = True skips weight validation, node checks and duplicate detection, the caller has to guarantee valid and unique edges
+        #returns the number of inserted edges, edges before an invalid one stay inserted
+        def addEdges(self, edges, trusted = False):
+            if self._report is None:
+                return self._addEdges(edges, trusted)
+            start = time.perf_counter()
+            inserted = self._addEdges(edges, trusted)
+            self._report('addEdges', {'inserted': inserted}, time.perf_counter() - start)
+            return inserted
+
+        def _addEdges(self, edges, trusted):
+            if self._representation == Base.Graph.CSR:
+                raise Base.GraphException('CSR graphs are read-only!')
+            weighted = self._weighted
+            neighbourRep = self._representation == Base.Graph.NEIGHBOUR
+            nodeIDs = self._nodeIDs
+            edgeIndex = None if neighbourRep else self._edgeIndex
+            #opposites of the nodes touched by this batch (neighbour representation only)
+            known = dict()
+            inserted = 0
+
+            for edge in edges:
+                if len(edge) == 3:
+                    m, n, weight = edge
+                else:
+                    m, n = edge
+                    weight = None
+                if not trusted:
+                    if weighted and (weight == None or weight < 0):
+                        raise Base.GraphException('Expected non-negative weight')
+                    if neighbourRep:
+                        for node in (m, n):
+                            if node not in known:
+                                if node not in nodeIDs and not callable(getattr(node, "addNeighbour", None)):
+                                    raise TypeError("Expected a Node object")
+                                if isinstance(node, Base.CompactNode):
+                                    known[node] = set(node.opposites())
+                                else:
+                                    known[node] = set(neighbour.opposite() for neighbour in node.neighbours())
+                        if n in known[m]:
+                            continue
+                        known[m].add(n)
+                        if not self._directed:
+                            known[n].add(m)
+                    elif (m, n) in edgeIndex:
+                        continue
+
+                if neighbourRep:
+                    self._addNode(m)
+                    self._addNode(n)
+                    self._insertNeighbours(m, n, weight)
+                else:
+                    self._insertEdge(m, n, weight)
+                inserted += 1
+            return inserted
+
+        #"private" method that inserts a new edge in edge representation, the edge must not exist yet
+        def _insertEdge(self, m, n, weight):
             if self._weighted:
                 e = Base.WeightedEdge(m, n, weight)
             else:
                 e = Base.Edge(m, n)
-            self._edges.append(e)              
+            self._edges.append(e)
+            self._edgeIndex[(m, n)] = e
+            if not self._directed:
+                self._edgeIndex[(n, m)] = e
             #add nodes
             self._addNode(m)
             self._addNode(n)
+            #update adjacency
+            self._adjacency[m].append((n, e))
+            if self._directed:
+                self._inAdjacency[n].append((m, e))
+            elif m is not n:
+                self._adjacency[n].append((m, e))
+            self._edgeAdded(m, n, weight)
             return e
         
         #"private" method for adding edges in neighbour representation
@@ -269,11 +667,18 @@ class Base():
             if not hasattr(m, "neighbours") or not hasattr(n, "neighbours"):
                 raise TypeError("Expected a Node object")
             #check if edge already exists
-            for neighbour in m.neighbours():
-                if neighbour.opposite() is n:
+            if isinstance(m, Base.CompactNode):
+                neighbour = m.neighbour(n)
+                if neighbour is not None:
                     self._addNode(m)
                     self._addNode(n)
                     return neighbour
+            else:
+                for neighbour in m.neighbours():
+                    if neighbour.opposite() is n:
+                        self._addNode(m)
+                        self._addNode(n)
+                        return neighbour
             
             #add nodes
             self._addNode(m)
@@ -283,13 +688,108 @@ class Base():
                 
             if not self._directed:
                 self._addNeighbour(n, m, weight)
-                
+            self._edgeAdded(m, n, weight)
             return mNeighbour
+
+        #"private" method that adds the neighbour objects of a new edge without any checks
+        def _insertNeighbours(self, m, n, weight):
+            if self._weighted:
+                m.addNeighbour(Base.WeightedNeighbour(n, weight))
+                if not self._directed:
+                    n.addNeighbour(Base.WeightedNeighbour(m, weight))
+            else:
+                m.addNeighbour(Base.Neighbour(n))
+                if not self._directed:
+                    n.addNeighbour(Base.Neighbour(m))
+            self._edgeAdded(m, n, weight)
             
         def _addNode(self, node):
             #only add nodes that do not exist in the graph yet
-            if node not in self._nodes:
+            if node not in self._nodeIDs:
+                self._nodeIDs[node] = len(self._nodes)
                 self._nodes.append(node)
+                if self._representation == Base.Graph.EDGE:
+                    self._adjacency[node] = []
+                    if self._directed:
+                        self._inAdjacency[node] = []
+                if self._componentIndex is not None:
+                    self._componentIndex.makeSet(node)
+
+        #keeps derived indices in sync after a new edge from m to n was inserted
+        def _edgeAdded(self, m, n, weight):
+            self._reverseIndex = None
+            self._adjacencyMatrix = None
+            self._sccIndex = None
+            self._reachability = None
+            if self._componentIndex is not None:
+                self._componentIndex.union(m, n)
+            if self._mstTree is not None:
+                self._updateMST(m, n, weight)
+            if self._ssspTrees:
+                alg = Base.SSSP(self)
+                for dist, prev in self._ssspTrees.values():
+                    alg.insertEdge(dist, prev, m, n, weight)
+
+        #inserts the edge m-n into the maintained spanning forest
+        #if it closes a cycle, the heaviest edge on that cycle is removed (it may be the new edge itself)
+        #finding the cycle costs O(length of the tree path), a rejected edge costs nothing more
+        #an accepted edge re-roots the part of the forest that moves below the other end: O(size of that part)
+        def _updateMST(self, m, n, weight):
+            tree = self._mstTree
+            if m is n:
+                return
+            for node in (m, n):
+                if node not in tree:
+                    tree[node] = dict()
+                    self._mstParent[node] = None
+                    self._mstDepth[node] = 0
+            path = self._treePath(m, n)
+            child, parent = n, m
+            if path is not None:
+                #heaviest edge on the tree path from m to n
+                heaviest = max(range(len(path) - 1), key = lambda i: tree[path[i]][path[i + 1]])
+                node1, node2 = path[heaviest], path[heaviest + 1]
+                if tree[node1][node2] <= weight:
+                    return
+                del tree[node1][node2]
+                del tree[node2][node1]
+                #the lower end of the removed edge lost its parent, its subtree holds m or n and is moved
+                if self._mstParent[node1] is node2:
+                    child, parent = m, n
+            tree[m][n] = weight
+            tree[n][m] = weight
+            self._rootMST(child, parent)
+
+        #sets parent and depth of the tree of child (without the side of parent) so that child hangs below parent
+        def _rootMST(self, child, parent):
+            tree, parents, depths = self._mstTree, self._mstParent, self._mstDepth
+            parents[child] = parent
+            depths[child] = 0 if parent is None else depths[parent] + 1
+            store = deque([child])
+            while store:
+                node = store.popleft()
+                for neighbour in tree[node]:
+                    if neighbour is not parents[node]:
+                        parents[neighbour] = node
+                        depths[neighbour] = depths[node] + 1
+                        store.append(neighbour)
+
+        #returns the nodes on the path from m to n in the maintained spanning forest, None if there is none
+        #both ends walk up to their lowest common ancestor, O(length of the path)
+        def _treePath(self, m, n):
+            parents, depths = self._mstParent, self._mstDepth
+            up, down = [m], [n]
+            while depths[up[-1]] > depths[down[-1]]:
+                up.append(parents[up[-1]])
+            while depths[down[-1]] > depths[up[-1]]:
+                down.append(parents[down[-1]])
+            while up[-1] is not down[-1]:
+                #two different roots, m and n are in different trees
+                if parents[up[-1]] is None:
+                    return None
+                up.append(parents[up[-1]])
+                down.append(parents[down[-1]])
+            return up + down[-2::-1]
         
         #adds the correct type of neighbour object to the node
         def _addNeighbour(self, m, n, weight = None):
@@ -316,69 +816,93 @@ class Base():
             elif self._representation == Base.Graph.NEIGHBOUR:
                 edgeCounter = 0
                 for node in self._nodes:
-                    edgeCounter += len(node.neighbours())
+                    if isinstance(node, Base.CompactNode):
+                        edgeCounter += node.degree()
+                    else:
+                        edgeCounter += len(node.neighbours())
                 if not self._directed:
                     return edgeCounter / 2
                 else:
                     return edgeCounter
+            elif self._representation == Base.Graph.CSR:
+                return self._numEdges
 
         #DOT pretty printer
         def DOTprint(self):
+            return "".join(self.iterDOT())
+
+        #returns a generator of the DOT output in chunks of whole lines, joined they equal DOTprint()
+        #runs in O(V+E) and only holds a single line in memory
+        def iterDOT(self):
             if not self._printable:
                 raise Base.GraphException('Unprintable graph!')
+            return self._iterDOT()
+
+        #writes the DOT output to file, which is either a path or a file object
+        #with compress = True the output is gzipped (file objects have to be opened in binary mode then)
+        def writeDOT(self, file, compress = False):
+            lines = self.iterDOT()
+            if isinstance(file, (str, os.PathLike)):
+                if compress:
+                    f = gzip.open(file, 'wt', encoding = 'utf-8', newline = '')
+                else:
+                    f = open(file, 'w', encoding = 'utf-8', newline = '')
+                with f:
+                    f.writelines(lines)
+            elif compress:
+                with gzip.GzipFile(fileobj = file, mode = 'wb') as f:
+                    for line in lines:
+                        f.write(line.encode('utf-8'))
+            else:
+                file.writelines(lines)
 
+        def _iterDOT(self):
             #start a graph
             if self._directed:
-                DOTstring = 'digraph g{\nnode[label=""]; \n'
+                yield 'digraph g{\nnode[label=""]; \n'
             else:
-                DOTstring = 'graph g{\nnode[label=""]; \n'
-            
+                yield 'graph g{\nnode[label=""]; \n'
+
             if self._representation == Base.Graph.EDGE:
-                DOTstring += self._DOTedges()
+                yield from self._DOTedges()
             elif self._representation == Base.Graph.NEIGHBOUR:
-                DOTstring += self._DOTneighbour()
+                yield from self._DOTneighbour()
+            elif self._representation == Base.Graph.CSR:
+                yield from self._DOTcsr()
             #finish graph
-            DOTstring += "}"
-            return DOTstring
-                    
-        #returns a string containing dot syntax of the edges in edge representation
+            yield "}"
+
+        #yields the dot syntax of the edges in edge representation
         def _DOTedges(self):
-            DOTstring = ""
             #add every edge
             for edge in self._edges:
                 if self._weighted:
-                    DOTstring += self._singleDOTedge(edge.node1(), edge.node2(), edge.weight())
+                    yield self._singleDOTedge(edge.node1(), edge.node2(), edge.weight())
                 else:
-                    DOTstring += self._singleDOTedge(edge.node1(), edge.node2())
-            return DOTstring
-        
-        #returns a string containing dot syntax of the edges in neighbour representation
+                    yield self._singleDOTedge(edge.node1(), edge.node2())
+
+        #yields the dot syntax of the edges in neighbour representation
         def _DOTneighbour(self):
-            DOTstring = ""
-            visited = []
-            for node in self._nodes:
-                if self._directed:
-                    for neighbour in node.neighbours():
-                        if self._weighted:
-                            DOTstring += self._singleDOTedge(
-                                node, neighbour.opposite(), neighbour.weight())
-                        else:
-                            DOTstring += self._singleDOTedge(node, neighbour.opposite())
-                        
-                else:
-                    for neighbour in node.neighbours():
-                        if neighbour.opposite() in visited:
-                            continue
-                        if self._weighted:
-                            DOTstring += self._singleDOTedge(
-                                node, neighbour.opposite(), neighbour.weight())
-                        else:
-                            DOTstring += self._singleDOTedge(node, neighbour.opposite())
+            for nodeID, node in enumerate(self._nodes):
+                for neighbour in node.neighbours():
+                    #undirected edges are printed once, from the node that was added first
+                    #(undirected self loops are stored twice and printed twice, like DOTprint always did)
+                    if not self._directed and self._nodeIDs[neighbour.opposite()] < nodeID:
+                        continue
+                    if self._weighted:
+                        yield self._singleDOTedge(node, neighbour.opposite(), neighbour.weight())
+                    else:
+                        yield self._singleDOTedge(node, neighbour.opposite())
+
+        #yields the dot syntax of the edges in CSR representation
+        def _DOTcsr(self):
+            for nodeID in range(len(self._nodes)):
+                for i in range(self._offsets[nodeID], self._offsets[nodeID + 1]):
+                    targetID = self._targets[i]
+                    if not self._directed and targetID < nodeID: continue
+                    yield self._singleDOTedge(
+                        self._nodes[nodeID], self._nodes[targetID], self._csrWeight(i) if self._weighted else None)
 
-                visited.append(node)
-                
-            return DOTstring
-        
         #returns the correct DOT representation for the current graph of a single edge
         #followed by a linebreak
         #a value for weight is expected for weighted graphs
@@ -402,144 +926,1273 @@ class Base():
             if self._traversal == None:
                 raise Base.GraphException('Traversal mode currently turned off!')
 
-            if (startNode not in self._nodes) or (goalNode not in self._nodes):
+            if (startNode not in self._nodeIDs) or (goalNode not in self._nodeIDs):
                 raise Base.GraphException('Either start or goal are not part of this graph!')
-            
-            #initialise suitable data structure and add startNode
-            visited = []
-            store = Base.TraversalStore(self._traversal)
-            store.add(startNode)
-            visited.append(startNode)
-
-            while not store.empty():
-                node = store.get()
+            if self._report is None:
+                return self._search(startNode, goalNode, None)
+            counters = dict()
+            start = time.perf_counter()
+            found = self._search(startNode, goalNode, counters)
+            counters['found'] = int(found)
+            self._report('search', counters, time.perf_counter() - start)
+            return found
+
+        #counters (a dict or None) receives the number of expanded nodes of a plain BFS/DFS
+        def _search(self, startNode, goalNode, counters):
+            if self._componentIndex is not None:
+                return self._componentIndex.find(startNode) is self._componentIndex.find(goalNode)
+            if self._SCC:
+                return self._condensationSearch(startNode, goalNode)
+            if self._traversal == Base.Graph.BIDIRECTIONAL:
+                return self._bidirectionalSearch(startNode, goalNode)
+            if self._traversal == Base.Graph.FRONTIER:
+                return self._levels([self._nodeIDs[startNode]], self._nodeIDs[goalNode])[self._nodeIDs[goalNode]] >= 0
+
+            #the traversal stops as soon as goalNode is reached
+            expanded = 0
+            found = False
+            for node in self._traverse(startNode, self._traversal, False):
+                expanded += 1
                 if node is goalNode:
-                    return True
-                
-                for neighbour in self.getNeighbourhood(node):
+                    found = True
+                    break
+            if counters is not None:
+                counters['nodesExpanded'] = expanded
+            return found
+
+        #breadth first search from both ends (along reversed edges from goalNode in digraphs)
+        #always expands the smaller frontier by one level and stops as soon as the frontiers meet
+        def _bidirectionalSearch(self, startNode, goalNode):
+            if startNode is goalNode:
+                return True
+            forwardVisited, backwardVisited = {startNode}, {goalNode}
+            forwardFrontier, backwardFrontier = [startNode], [goalNode]
+
+            while forwardFrontier and backwardFrontier:
+                if len(forwardFrontier) <= len(backwardFrontier):
+                    forwardFrontier = self._expandFrontier(forwardFrontier, forwardVisited, backwardVisited, self._neighbourhood)
+                    if forwardFrontier is None:
+                        return True
+                else:
+                    backwardFrontier = self._expandFrontier(backwardFrontier, backwardVisited, forwardVisited, self._predecessors)
+                    if backwardFrontier is None:
+                        return True
+            return False
+
+        #returns the next level of a bidirectional search or None if it touches the nodes visited from the other end
+        def _expandFrontier(self, frontier, visited, otherVisited, neighbourhood):
+            nextFrontier = []
+            for node in frontier:
+                for neighbour in neighbourhood(node):
+                    if neighbour in otherVisited:
+                        return None
                     if neighbour not in visited:
-                        store.add(neighbour)
-                        visited.append(neighbour)
+                        visited.add(neighbour)
+                        nextFrontier.append(neighbour)
+            return nextFrontier
+
+        #returns the adjacency matrix as NumPy CSR arrays (indptr, indices, data), row i holds the edges leaving the node with ID i
+        #data holds the weights (ones for unweighted graphs), undirected edges are stored in both rows
+        #the arrays are cached until the next edge is added, CSR graphs share their buffers with the matrix
+        def adjacencyMatrix(self):
+            if np is None:
+                raise Base.GraphException('NumPy is required for the adjacency matrix!')
+            if self._adjacencyMatrix is None:
+                offsets, targets, weights, intWeights = self._csrArrays()
+                indptr = np.frombuffer(offsets, dtype = np.int64)
+                indices = np.frombuffer(targets, dtype = np.int64)
+                if weights is None:
+                    data = np.ones(len(indices), dtype = np.int8)
+                else:
+                    data = np.frombuffer(weights, dtype = np.int64 if Base.Graph._typecode(weights) == 'q' else np.float64)
+                self._adjacencyMatrix = (indptr, indices, data)
+            return self._adjacencyMatrix
+
+        #returns the hop distances from source (or the nearest of several sources) to all nodes as a NumPy array
+        #indexed by node ID, -1 for unreachable nodes (level synchronous BFS on the adjacency matrix)
+        def levels(self, sources):
+            if np is None:
+                raise Base.GraphException('NumPy is required for levels!')
+            if isinstance(sources, (list, tuple, set, frozenset)):
+                sources = list(sources)
+            else:
+                sources = [sources]
+            for source in sources:
+                if source not in self._nodeIDs:
+                    raise Base.GraphException('Node not in graph!')
+            return self._levels([self._nodeIDs[source] for source in sources])
+
+        #every level gathers the rows of all frontier nodes at once (the boolean product frontier x matrix)
+        #and keeps the targets that have no level yet, stops early once goalID has a level
+        def _levels(self, sourceIDs, goalID = None):
+            indptr, indices, data = self.adjacencyMatrix()
+            level = np.full(len(self._nodes), -1, dtype = np.int64)
+            frontier = np.unique(np.array(sourceIDs, dtype = np.int64))
+            level[frontier] = 0
+            depth = 0
+            while len(frontier) > 0 and (goalID is None or level[goalID] < 0):
+                depth += 1
+                positions = Base.Graph._rowPositions(indptr, frontier)
+                if len(positions) == 0:
+                    break
+                targets = indices[positions]
+                frontier = np.unique(targets[level[targets] < 0])
+                level[frontier] = depth
+            return level
+
+        #returns the positions in indices of all edges in the given rows of the adjacency matrix
+        @staticmethod
+        def _rowPositions(indptr, rows):
+            starts = indptr[rows]
+            counts = indptr[rows + 1] - starts
+            #start of the row + offset inside the row
+            rowStarts = np.cumsum(counts) - counts
+            return np.repeat(starts - rowStarts, counts) + np.arange(int(counts.sum()))
+
+        #returns the strongly connected components as lists of nodes (Tarjan's algorithm without recursion, O(V+E))
+        #components come in reverse topological order, no edge leads from a component to a later one
+        def scc(self):
+            neighbourhood = self._neighbourhood
+            index = dict()
+            low = dict()
+            stack = []
+            onStack = set()
+            components = []
+            counter = 0
+
+            for root in self._nodes:
+                if root in index: continue
+                index[root] = low[root] = counter
+                counter += 1
+                stack.append(root)
+                onStack.add(root)
+                #emulates the call stack: (node, iterator over its remaining neighbours)
+                work = [(root, iter(neighbourhood(root)))]
+                while work:
+                    node, neighbours = work[-1]
+                    descended = False
+                    for neighbour in neighbours:
+                        if neighbour not in index:
+                            index[neighbour] = low[neighbour] = counter
+                            counter += 1
+                            stack.append(neighbour)
+                            onStack.add(neighbour)
+                            work.append((neighbour, iter(neighbourhood(neighbour))))
+                            descended = True
+                            break
+                        elif neighbour in onStack and index[neighbour] < low[node]:
+                            low[node] = index[neighbour]
+                    if descended: continue
+
+                    work.pop()
+                    if work and low[node] < low[work[-1][0]]:
+                        low[work[-1][0]] = low[node]
+                    if low[node] == index[node]:
+                        component = []
+                        while True:
+                            member = stack.pop()
+                            onStack.discard(member)
+                            component.append(member)
+                            if member is node: break
+                        components.append(component)
+            return components
+
+        #returns the cached condensation of the graph as (node -> component ID, successor component IDs per component)
+        #component IDs follow scc(), so every DAG edge leads to a smaller ID
+        def _condensation(self):
+            if self._sccIndex is None:
+                components = self.scc()
+                componentOf = dict()
+                for componentID, component in enumerate(components):
+                    for node in component:
+                        componentOf[node] = componentID
+                dag = [set() for component in components]
+                for node in self._nodes:
+                    componentID = componentOf[node]
+                    for neighbour in self._neighbourhood(node):
+                        if componentOf[neighbour] != componentID:
+                            dag[componentID].add(componentOf[neighbour])
+                self._sccIndex = (componentOf, dag)
+            return self._sccIndex
+
+        #reachability on the condensation DAG: O(1) inside a component, otherwise a search over the components
+        def _condensationSearch(self, startNode, goalNode):
+            componentOf, dag = self._condensation()
+            start, goal = componentOf[startNode], componentOf[goalNode]
+            if start == goal:
+                return True
+            #components with an ID below goal cannot lead to goal
+            visited = {start}
+            store = [start]
+            while store:
+                for successor in dag[store.pop()]:
+                    if successor == goal:
+                        return True
+                    if successor > goal and successor not in visited:
+                        visited.add(successor)
+                        store.append(successor)
             return False
 
+        #computes the transitive closure as one bitset (python int) per strongly connected component
+        #bit j of the bitset of component i is set if component j can be reached from component i
+        #components are processed in reverse topological order, so every successor is complete already
+        def buildReachability(self):
+            componentOf, dag = self._condensation()
+            closure = []
+            for componentID, successors in enumerate(dag):
+                bits = 1 << componentID
+                for successor in successors:
+                    bits |= closure[successor]
+                closure.append(bits)
+            self._reachability = closure
+
+        #returns an estimate of the memory in bytes buildReachability needs (builds the condensation index)
+        def reachabilityMemory(self):
+            componentOf, dag = self._condensation()
+            #python ints store 30 bits per 4 byte digit, plus one list slot per bitset
+            return len(dag) * (sys.getsizeof(0) + 4 * math.ceil(len(dag) / 30) + 8)
+
+        #checks wether node2 can be reached from node1 with a single bit test
+        #the closure is built on the first call and again after the graph changed
+        def reachable(self, node1, node2):
+            if (node1 not in self._nodeIDs) or (node2 not in self._nodeIDs):
+                raise Base.GraphException('Either start or goal are not part of this graph!')
+            if self._reachability is None:
+                self.buildReachability()
+            componentOf = self._sccIndex[0]
+            return (self._reachability[componentOf[node1]] >> componentOf[node2]) & 1 == 1
+
+        #checks wether node1 and node2 are in the same connected component (needs components = True)
+        def connected(self, node1, node2):
+            return self.componentOf(node1) is self.componentOf(node2)
+
+        #returns the representative node of the connected component containing node (needs components = True)
+        def componentOf(self, node):
+            if self._componentIndex is None:
+                raise Base.GraphException('Components index disabled for this graph!')
+            if node not in self._nodeIDs:
+                raise Base.GraphException('Node not in graph!')
+            return self._componentIndex.find(node)
+
+        #returns the number of connected components (needs components = True)
+        def numComponents(self):
+            if self._componentIndex is None:
+                raise Base.GraphException('Components index disabled for this graph!')
+            return self._componentIndex.count()
+
+        #returns a generator that yields the nodes reachable from startNode in breadth first order
+        #with details = True (node, depth, parent) tuples are yielded instead, parent is None for startNode
+        def bfs(self, startNode, details = False):
+            if startNode not in self._nodeIDs:
+                raise Base.GraphException('Node not in graph!')
+            return self._traverse(startNode, Base.Graph.BFS, details)
+
+        #returns a generator that yields the nodes reachable from startNode in depth first order
+        #with details = True (node, depth, parent) tuples are yielded instead, parent is None for startNode
+        def dfs(self, startNode, details = False):
+            if startNode not in self._nodeIDs:
+                raise Base.GraphException('Node not in graph!')
+            return self._traverse(startNode, Base.Graph.DFS, details)
+
+        #lazy traversal, BFS marks nodes as visited when they are added to the queue
+        def _traverse(self, startNode, traversalMode, details):
+            if traversalMode == Base.Graph.DFS:
+                return self._depthFirst(startNode, details)
+            return self._breadthFirst(startNode, details)
+
+        def _breadthFirst(self, startNode, details):
+            neighbourhood = self._neighbourhood
+            visited = {startNode}
+            store = deque()
+            get = store.popleft
+
+            if details:
+                store.append((startNode, 0, None))
+                while store:
+                    item = get()
+                    yield item
+                    node = item[0]
+                    depth = item[1] + 1
+                    for neighbour in neighbourhood(node):
+                        if neighbour not in visited:
+                            visited.add(neighbour)
+                            store.append((neighbour, depth, node))
+            else:
+                store.append(startNode)
+                while store:
+                    node = get()
+                    yield node
+                    for neighbour in neighbourhood(node):
+                        if neighbour not in visited:
+                            visited.add(neighbour)
+                            store.append(neighbour)
+
+        #DFS marks nodes as visited when they are taken from the stack, so a node is reached from the deepest node
+        #that pushed it (marking on push would give BFS-like parents), entries of already visited nodes are skipped
+        def _depthFirst(self, startNode, details):
+            neighbourhood = self._neighbourhood
+            visited = set()
+            stack = [(startNode, 0, None)]
+            while stack:
+                item = stack.pop()
+                node = item[0]
+                if node in visited:
+                    continue
+                visited.add(node)
+                yield item if details else node
+                depth = item[1] + 1
+                for neighbour in neighbourhood(node):
+                    if neighbour not in visited:
+                        stack.append((neighbour, depth, node))
+
         #returns a list of all nodes that are adjacent to node
         def getNeighbourhood(self, node):
-            if node not in self._nodes:
+            if node not in self._nodeIDs:
                 raise Base.GraphException('Node not in graph!')
+            if self._report is None:
+                return self._neighbourhood(node)
+            start = time.perf_counter()
+            neighbourhood = self._neighbourhood(node)
+            self._report('getNeighbourhood', {'neighbours': len(neighbourhood)}, time.perf_counter() - start)
+            return neighbourhood
 
-            neighbourhood = []
+        #"private" version of getNeighbourhood without the membership check
+        def _neighbourhood(self, node):
             if self._representation == Base.Graph.EDGE:
-                for edge in self._edges:
-                    if edge.node1() is node:
-                        neighbourhood.append(edge.node2())    
-                    elif edge.node2() is node:
-                        #directed edges point from node1 to node2
-                        if not self._directed:
-                            neighbourhood.append(edge.node1())
+                return [neighbour for neighbour, edge in self._adjacency[node]]
+            elif self._representation == Base.Graph.NEIGHBOUR:
+                if isinstance(node, Base.CompactNode):
+                    return node.opposites()
+                return [neighbour.opposite() for neighbour in node.neighbours()]
+            elif self._representation == Base.Graph.CSR:
+                nodeID = self._nodeIDs[node]
+                return [self._nodes[targetID] for targetID in self._targets[self._offsets[nodeID]:self._offsets[nodeID + 1]]]
+            else:
+                raise Base.GraphException('Unknown edge representation!')
+
+        #returns a list of all nodes that have an edge pointing to node (equals the neighbourhood in undirected graphs)
+        def predecessors(self, node):
+            if node not in self._nodeIDs:
+                raise Base.GraphException('Node not in graph!')
+            return self._predecessors(node)
+
+        #"private" version of predecessors without the membership check
+        def _predecessors(self, node):
+            if not self._directed:
+                return self._neighbourhood(node)
 
+            if self._representation == Base.Graph.EDGE:
+                return [neighbour for neighbour, edge in self._inAdjacency[node]]
             elif self._representation == Base.Graph.NEIGHBOUR:
+                if self._reverseIndex is None:
+                    self._buildReverseIndex()
+                return list(self._reverseIndex[node])
+            elif self._representation == Base.Graph.CSR:
+                if self._reverseCSR is None:
+                    self._buildReverseCSR()
+                offsets, sources = self._reverseCSR
+                nodeID = self._nodeIDs[node]
+                return [self._nodes[sourceID] for sourceID in sources[offsets[nodeID]:offsets[nodeID + 1]]]
+            else:
+                raise Base.GraphException('Unknown edge representation!')
+
+        #builds the predecessor lists of a directed graph in neighbour representation, dropped again by add
+        def _buildReverseIndex(self):
+            reverse = dict()
+            for node in self._nodes:
+                reverse[node] = []
+            for node in self._nodes:
                 for neighbour in node.neighbours():
-                    neighbourhood.append(neighbour.opposite())
+                    reverse[neighbour.opposite()].append(node)
+            self._reverseIndex = reverse
+
+        #returns a read-only copy of this graph in CSR representation, node IDs stay the same
+        def freeze(self):
+            G = Base.Graph(directed = self._directed, representation = Base.Graph.CSR, weighted = self._weighted,
+                           printable = self._printable, traversal = self._traversal, MST = self._MST, SSSP = self._SSSP,
+                           components = self._componentIndex is not None, SCC = self._SCC)
+            G._nodes = list(self._nodes)
+            G._nodeIDs = dict(self._nodeIDs)
+            G._offsets, G._targets, G._weights, G._intWeights = self._csrArrays()
+            G._numEdges = int(self.numEdges())
+            if G._componentIndex is not None:
+                for node in G._nodes:
+                    G._componentIndex.makeSet(node)
+                for edge in G.edges():
+                    G._componentIndex.union(edge.node1(), edge.node2())
+            return G
+
+        #returns a copy of the graph in another representation with the same nodes (in the same order, so IDs stay stable)
+        #and settings in O(V + E), CSR returns freeze()
+        #the neighbour representation stores the neighbours in the nodes, so nodes must not have any neighbours yet
+        def toRepresentation(self, representation):
+            if representation == Base.Graph.CSR:
+                return self.freeze()
+            if representation not in (Base.Graph.EDGE, Base.Graph.NEIGHBOUR):
+                raise Base.GraphException('Unknown edge representation!')
+            if representation == Base.Graph.NEIGHBOUR:
+                for node in self._nodes:
+                    if node.neighbours():
+                        raise Base.GraphException('Nodes already have neighbours, they can only be in one graph in neighbour representation!')
+            G = Base.Graph(directed = self._directed, representation = representation, weighted = self._weighted,
+                           printable = self._printable, traversal = self._traversal, MST = self._MST, SSSP = self._SSSP,
+                           components = self._componentIndex is not None, SCC = self._SCC,
+                           incrementalMST = self._incrementalMST, SSSPCache = self._SSSPCache)
+            for node in self._nodes:
+                G._addNode(node)
+            if self._weighted:
+                edges = ((edge.node1(), edge.node2(), edge.weight()) for edge in self.edges())
+            else:
+                edges = ((edge.node1(), edge.node2()) for edge in self.edges())
+            #undirected self loops are listed twice in neighbour representation, so only digraphs skip duplicate detection
+            G._addEdges(edges, self._directed)
+            return G
+
+        #switches this graph to another representation in place (see toRepresentation)
+        #nodes that leave the neighbour representation lose their neighbours, the observer is kept
+        def convert(self, representation):
+            if representation == self._representation:
+                return
+            G = self.toRepresentation(representation)
+            if self._representation == Base.Graph.NEIGHBOUR:
+                for node in self._nodes:
+                    node.removeNeighbours()
+            observer = self._observer
+            self.__dict__.clear()
+            self.__dict__.update(G.__dict__)
+            self.setObserver(observer)
+
+        #returns the (offsets, targets, weights, intWeights) arrays of the CSR representation of this graph (see __init__)
+        def _csrArrays(self):
+            if self._representation == Base.Graph.CSR:
+                return self._offsets, self._targets, self._weights, self._intWeights
+            offsets = array('q', [0])
+            targets = array('q')
+            weights = list()
+            for node in self._nodes:
+                if self._weighted:
+                    for neighbour, weight in self._weightedNeighbours(node):
+                        targets.append(self._nodeIDs[neighbour])
+                        weights.append(weight)
+                else:
+                    for neighbour in self._neighbourhood(node):
+                        targets.append(self._nodeIDs[neighbour])
+                offsets.append(len(targets))
+            if not self._weighted:
+                return offsets, targets, None, None
+            weightArray = Base.Graph._weightArray(weights)
+            return offsets, targets, weightArray, Base.Graph._intMarkers(weights, weightArray)
+
+        #packs weights into a contiguous array, integer weights are kept as integers so printing does not change
+        @staticmethod
+        def _weightArray(weights):
+            if all(type(weight) is int and -2 ** 63 <= weight < 2 ** 63 for weight in weights):
+                return array('q', weights)
+            return array('d', weights)
+
+        #marks the int weights that _weightArray had to store as doubles, returns None if there are none
+        #ints beyond 2**53 lose precision in a double array
+        @staticmethod
+        def _intMarkers(weights, weightArray):
+            if weightArray.typecode == 'q':
+                return None
+            markers = array('b', [type(weight) is int for weight in weights])
+            return markers if any(markers) else None
+
+        #returns the weight of the CSR edge at position i as it was added (int or float)
+        def _csrWeight(self, i):
+            if self._intWeights is not None and self._intWeights[i]:
+                return int(self._weights[i])
+            return self._weights[i]
+
+        #builds the (offsets, sources) arrays of the incoming edges of a digraph in CSR representation
+        def _buildReverseCSR(self):
+            counts = array('q', bytes(8 * (len(self._nodes) + 1)))
+            for targetID in self._targets:
+                counts[targetID + 1] += 1
+            for i in range(len(self._nodes)):
+                counts[i + 1] += counts[i]
+            offsets = array('q', counts)
+            sources = array('q', bytes(8 * len(self._targets)))
+            for nodeID in range(len(self._nodes)):
+                for i in range(self._offsets[nodeID], self._offsets[nodeID + 1]):
+                    targetID = self._targets[i]
+                    sources[counts[targetID]] = nodeID
+                    counts[targetID] += 1
+            self._reverseCSR = (offsets, sources)
+
+        #snapshot file format (version 2), all header fields are little-endian:
+        #magic, version, flags, representation, traversal, number of nodes, number of targets, number of edges
+        #followed by the offsets (nodes + 1), targets and, for weighted graphs, weights arrays in CSR layout
+        #the arrays hold 8 byte integers (weights: integers or doubles) in the byte order of the writing machine
+        #with the edgeOrder flag (edge representation) the CSR positions of the edges in insertion order follow (version 2),
+        #they keep the order and the direction (node1, node2) of the edges when the graph is rebuilt
+        #with the intWeights flag a byte per weight follows that marks the double weights that were ints (version 2)
+        #nodes are identified by their ID, load creates a new Base.Node for every ID
+        _SNAPSHOT_HEADER = struct.Struct('<4sHHBB6xqqq')
+        _SNAPSHOT_MAGIC = b'GPLG'
+        _SNAPSHOT_VERSION = 2
+        #oldest version load can read, version 1 has no intWeights flag
+        _SNAPSHOT_MIN_VERSION = 1
+        _SNAPSHOT_REPRESENTATIONS = (NEIGHBOUR, EDGE, CSR)
+        _SNAPSHOT_TRAVERSALS = (None, BFS, DFS, BIDIRECTIONAL, FRONTIER)
+        _SNAPSHOT_FLAGS = ('directed', 'weighted', 'printable', 'MST', 'SSSP', 'components', 'SCC', 'floatWeights', 'bigEndian', 'intWeights', 'edgeOrder')
+
+        #writes the graph to a binary snapshot file that can be read with Graph.load
+        def save(self, path):
+            offsets, targets, weights, intWeights = self._csrArrays()
+            settings = {'directed': self._directed, 'weighted': self._weighted, 'printable': self._printable, 'MST': self._MST,
+                        'SSSP': self._SSSP, 'components': self._componentIndex is not None, 'SCC': self._SCC,
+                        'floatWeights': weights is not None and Base.Graph._typecode(weights) == 'd',
+                        'bigEndian': sys.byteorder == 'big', 'intWeights': intWeights is not None,
+                        'edgeOrder': self._representation == Base.Graph.EDGE}
+            flags = 0
+            for bit, name in enumerate(Base.Graph._SNAPSHOT_FLAGS):
+                if settings[name]:
+                    flags |= 1 << bit
+            header = Base.Graph._SNAPSHOT_HEADER.pack(
+                Base.Graph._SNAPSHOT_MAGIC, Base.Graph._SNAPSHOT_VERSION, flags,
+                Base.Graph._SNAPSHOT_REPRESENTATIONS.index(self._representation),
+                Base.Graph._SNAPSHOT_TRAVERSALS.index(self._traversal), len(self._nodes), len(targets), int(self.numEdges()))
+            with open(path, 'wb') as f:
+                f.write(header)
+                f.write(offsets)
+                f.write(targets)
+                if weights is not None:
+                    f.write(weights)
+                if settings['edgeOrder']:
+                    f.write(self._edgePositions(offsets))
+                if intWeights is not None:
+                    f.write(intWeights)
+
+        #returns the CSR positions (see _csrArrays) of the edges of a graph in edge representation in insertion order
+        def _edgePositions(self, offsets):
+            positions = dict()
+            for nodeID, node in enumerate(self._nodes):
+                for i, (neighbour, edge) in enumerate(self._adjacency[node]):
+                    if edge.node1() is node and edge.node2() is neighbour:
+                        positions.setdefault(edge, offsets[nodeID] + i)
+            return array('q', [positions[edge] for edge in self._edges])
+
+        #reads a snapshot written by save
+        #with mmap = True the file is mapped into memory and the returned read-only CSR graph uses it without copying,
+        #otherwise the file is read and the graph is rebuilt in the representation it had when it was saved
+        @staticmethod
+        def load(path, mmap = True):
+            header = Base.Graph._SNAPSHOT_HEADER
+            with open(path, 'rb') as f:
+                data = f.read(header.size)
+                if len(data) < header.size:
+                    raise Base.GraphException('Not a graph snapshot!')
+                magic, version, flags, representation, traversal, numNodes, numTargets, numEdges = header.unpack(data)
+                if magic != Base.Graph._SNAPSHOT_MAGIC:
+                    raise Base.GraphException('Not a graph snapshot!')
+                if not Base.Graph._SNAPSHOT_MIN_VERSION <= version <= Base.Graph._SNAPSHOT_VERSION:
+                    raise Base.GraphException('Unsupported snapshot version ' + str(version))
+                settings = {name: bool(flags & (1 << bit)) for bit, name in enumerate(Base.Graph._SNAPSHOT_FLAGS)}
+                swap = settings['bigEndian'] != (sys.byteorder == 'big')
+                weightCode = 'd' if settings['floatWeights'] else 'q'
+                sections = [('q', numNodes + 1), ('q', numTargets)]
+                if settings['weighted']:
+                    sections.append((weightCode, numTargets))
+                if settings['edgeOrder']:
+                    sections.append(('q', numEdges))
+                if settings['intWeights']:
+                    sections.append(('b', numTargets))
+
+                if mmap:
+                    if swap:
+                        raise Base.GraphException('Snapshot was written with a different byte order, load it with mmap = False')
+                    buffer = memoryview(memoryMap(f.fileno(), 0, access = ACCESS_READ))
+                else:
+                    f.seek(0)
+                    buffer = memoryview(f.read())
+            if len(buffer) < header.size + sum(array(typecode).itemsize * length for typecode, length in sections):
+                raise Base.GraphException('Truncated snapshot!')
+
+            arrays = []
+            position = header.size
+            for typecode, length in sections:
+                size = array(typecode).itemsize * length
+                part = buffer[position:position + size]
+                position += size
+                if mmap:
+                    arrays.append(part.cast(typecode))
+                else:
+                    values = array(typecode)
+                    values.frombytes(part)
+                    if swap:
+                        values.byteswap()
+                    arrays.append(values)
+            offsets, targets = arrays[0], arrays[1]
+            weights = arrays[2] if settings['weighted'] else None
+            edgeOrder = arrays[-2 if settings['intWeights'] else -1] if settings['edgeOrder'] else None
+            intWeights = arrays[-1] if settings['intWeights'] else None
+
+            if mmap or Base.Graph._SNAPSHOT_REPRESENTATIONS[representation] == Base.Graph.CSR:
+                representation = Base.Graph.CSR
+            else:
+                representation = Base.Graph._SNAPSHOT_REPRESENTATIONS[representation]
+            G = Base.Graph(directed = settings['directed'], representation = representation, weighted = settings['weighted'],
+                           printable = settings['printable'], traversal = Base.Graph._SNAPSHOT_TRAVERSALS[traversal],
+                           MST = settings['MST'], SSSP = settings['SSSP'], components = settings['components'], SCC = settings['SCC'])
+            nodes = [Base.Node() for i in range(numNodes)]
+            if representation == Base.Graph.CSR:
+                G._nodes = nodes
+                G._nodeIDs = {node: nodeID for nodeID, node in enumerate(nodes)}
+                G._offsets, G._targets, G._weights, G._intWeights = offsets, targets, weights, intWeights
+                G._numEdges = numEdges
+                if G._componentIndex is not None:
+                    for node in nodes:
+                        G._componentIndex.makeSet(node)
+                    for edge in G.edges():
+                        G._componentIndex.union(edge.node1(), edge.node2())
+                return G
+
+            for node in nodes:
+                G._addNode(node)
+            directed = settings['directed']
+            def edge(nodeID, i):
+                if weights is None:
+                    return nodes[nodeID], nodes[targets[i]]
+                elif intWeights is not None and intWeights[i]:
+                    return nodes[nodeID], nodes[targets[i]], int(weights[i])
+                return nodes[nodeID], nodes[targets[i]], weights[i]
+            def edges():
+                #edge representation: insertion order, the row of a position is the last one starting at or before it
+                if edgeOrder is not None:
+                    for i in edgeOrder:
+                        yield edge(bisect_right(offsets, i) - 1, i)
+                    return
+                for nodeID in range(numNodes):
+                    for i in range(offsets[nodeID], offsets[nodeID + 1]):
+                        #undirected edges are stored in both directions
+                        if not directed and targets[i] < nodeID: continue
+                        yield edge(nodeID, i)
+            #undirected self loops may appear twice in rows, so only digraphs and edge orders skip duplicate detection
+            G.addEdges(edges(), trusted = directed or edgeOrder is not None)
+            return G
+
+        #size hint in bytes for the chunks of lines read from an edge list
+        _EDGE_LIST_CHUNK = 1 << 20
+
+        #builds a graph from an edge list text file (a path, also .gz, or an open text file) with one `src dst [weight]` per line
+        #delimiter = None splits on whitespace, use ',' for CSV, empty lines and lines starting with # are skipped
+        #every label gets one Base.Node, pass a dict as labels to get (or prefill) the label -> node map
+        #the file is read in chunks and streamed into addEdges, with workers > 1 the chunks are parsed by worker processes
+        #duplicate edges are skipped, CSR graphs are built in edge representation and frozen
+        @staticmethod
+        def fromEdgeList(source, directed = False, weighted = False, representation = None, labels = None, delimiter = None,
+                         workers = 1, traversal = None):
+            if labels is None:
+                labels = dict()
+            buildRepresentation = Base.Graph.EDGE if representation == Base.Graph.CSR else representation
+            G = Base.Graph(directed = directed, representation = buildRepresentation, weighted = weighted, traversal = traversal)
+
+            if isinstance(source, (str, os.PathLike)):
+                if os.fspath(source).endswith('.gz'):
+                    f = gzip.open(source, 'rt', encoding = 'utf-8')
+                else:
+                    f = open(source, 'r', encoding = 'utf-8')
+                with f:
+                    G.addEdges(Base.Graph._internEdges(f, labels, weighted, delimiter, workers))
+            else:
+                G.addEdges(Base.Graph._internEdges(source, labels, weighted, delimiter, workers))
+
+            if representation == Base.Graph.CSR:
+                return G.freeze()
+            return G
+
+        #yields the parsed edges of a text file with nodes instead of labels
+        @staticmethod
+        def _internEdges(f, labels, weighted, delimiter, workers):
+            def chunks():
+                while True:
+                    lines = f.readlines(Base.Graph._EDGE_LIST_CHUNK)
+                    if not lines:
+                        return
+                    yield lines
+
+            if workers == None:
+                workers = os.cpu_count() or 1
+            if workers > 1:
+                parsed = Base.Graph._parseInPool(chunks(), weighted, delimiter, workers)
+            else:
+                parsed = (Base.Graph._parseEdgeLines(lines, weighted, delimiter) for lines in chunks())
+
+            for rows in parsed:
+                for row in rows:
+                    m = labels.get(row[0])
+                    if m is None:
+                        m = labels[row[0]] = Base.Node()
+                    n = labels.get(row[1])
+                    if n is None:
+                        n = labels[row[1]] = Base.Node()
+                    if weighted:
+                        yield m, n, row[2]
+                    else:
+                        yield m, n
+
+        #parses the chunks in worker processes and yields the results in file order
+        #only a few chunks per worker are in flight so the file is never read completely into memory
+        @staticmethod
+        def _parseInPool(chunks, weighted, delimiter, workers):
+            with ProcessPoolExecutor(max_workers = workers) as pool:
+                pending = deque()
+                for lines in chunks:
+                    pending.append(pool.submit(Base.Graph._parseEdgeLines, lines, weighted, delimiter))
+                    if len(pending) >= 2 * workers:
+                        yield pending.popleft().result()
+                while pending:
+                    yield pending.popleft().result()
+
+        #returns a list of (src, dst) or (src, dst, weight) tuples of labels, weights are ints where possible
+        @staticmethod
+        def _parseEdgeLines(lines, weighted, delimiter):
+            rows = []
+            for line in lines:
+                line = line.strip()
+                if not line or line.startswith('#'):
+                    continue
+                fields = line.split(delimiter)
+                if delimiter is not None:
+                    fields = [field.strip() for field in fields]
+                if len(fields) < (3 if weighted else 2):
+                    raise Base.GraphException('Expected src dst' + (' weight' if weighted else '') + ', got ' + repr(line))
+                if weighted:
+                    try:
+                        weight = int(fields[2])
+                    except ValueError:
+                        try:
+                            weight = float(fields[2])
+                        except ValueError:
+                            raise Base.GraphException('Invalid weight in ' + repr(line))
+                    rows.append((fields[0], fields[1], weight))
+                else:
+                    rows.append((fields[0], fields[1]))
+            return rows
+
+        #returns the typecode of an array or the format of a memoryview (mapped snapshots)
+        @staticmethod
+        def _typecode(values):
+            if isinstance(values, memoryview):
+                return values.format
+            return values.typecode
+
+        #returns a list of (neighbour, weight) pairs for all edges leaving node in a weighted graph
+        def _weightedNeighbours(self, node):
+            if self._representation == Base.Graph.EDGE:
+                return [(neighbour, edge.weight()) for neighbour, edge in self._adjacency[node]]
+            elif self._representation == Base.Graph.NEIGHBOUR:
+                if isinstance(node, Base.CompactNode):
+                    return node.weightedOpposites()
+                return [(neighbour.opposite(), neighbour.weight()) for neighbour in node.neighbours()]
+            elif self._representation == Base.Graph.CSR:
+                nodeID = self._nodeIDs[node]
+                start, end = self._offsets[nodeID], self._offsets[nodeID + 1]
+                if self._intWeights is not None:
+                    return [(self._nodes[self._targets[i]], self._csrWeight(i)) for i in range(start, end)]
+                return [(self._nodes[targetID], weight) for targetID, weight in zip(self._targets[start:end], self._weights[start:end])]
             else:
                 raise Base.GraphException('Unknown edge representation!')
-            return neighbourhood
 
         #returns a Graph object containing the minimum spanning tree of this object, will throw an exception if Graphtype is wrong             
-        def MST(self):
+        #algorithm is one of Base.MST.KRUSKAL, Base.MST.PRIM, Base.MST.BORUVKA or Base.MST.AUTO (picks by density)
+        #workers is the number of processes used by BORUVKA (None uses all cores)
+        #with incrementalMST = True only the first call runs the algorithm, later calls copy the maintained tree in O(V)
+        def MST(self, algorithm = "kruskal", workers = None):
             if self._MST:
-                alg = Base.MST(self)
-                return alg.execute()
+                if self._report is None:
+                    return self._minimumSpanningTree(algorithm, workers)[0]
+                start = time.perf_counter()
+                mst, counters = self._minimumSpanningTree(algorithm, workers)
+                self._report('MST', counters, time.perf_counter() - start)
+                return mst
             else:
                 raise Base.GraphException('MST disabled for this graph!')
 
+        #returns the MST and the counters of the algorithm
+        def _minimumSpanningTree(self, algorithm, workers):
+            if self._mstTree is not None:
+                return self._copyMST(), {'maintained': 1}
+            alg = Base.MST(self)
+            mst = alg.execute(algorithm, workers)
+            if self._incrementalMST:
+                self._mstTree = dict()
+                for edge in mst.edges():
+                    self._mstTree.setdefault(edge.node1(), dict())[edge.node2()] = edge.weight()
+                    self._mstTree.setdefault(edge.node2(), dict())[edge.node1()] = edge.weight()
+                self._mstParent = dict()
+                self._mstDepth = dict()
+                for node in self._mstTree:
+                    if node not in self._mstParent:
+                        self._rootMST(node, None)
+            return mst, alg.counters()
+
+        #builds a Graph object from the maintained spanning forest
+        def _copyMST(self):
+            mst = Base.Graph(directed = False, weighted = True, traversal = Base.Graph.DFS)
+            for node, neighbours in self._mstTree.items():
+                for neighbour, weight in neighbours.items():
+                    mst.add(node, neighbour, weight)
+            return mst
+
         #returns a Graph object containing a directed tree rooted at the startnode. The edges represent the shortest path between the source and each node (weights stay the same)
-        def SSSP(self, source):
+        #engine = "vectorized" uses Bellman-Ford with NumPy on the adjacency matrix instead of Dijkstra (bypasses the SSSP cache)
+        def SSSP(self, source, engine = "dijkstra"):
             if self._SSSP:
                 alg = Base.SSSP(self)
+                if self._report is None:
+                    return self._shortestPathTree(source, engine, alg)
+                start = time.perf_counter()
+                G = self._shortestPathTree(source, engine, alg)
+                self._report('SSSP', alg.counters(), time.perf_counter() - start)
+                return G
+            else:
+                raise Base.GraphException('SSSP disabled for this graph!')
+
+        def _shortestPathTree(self, source, engine, alg):
+            if engine == Base.SSSP.VECTORIZED:
+                return alg.executeVectorized(source)
+            elif engine != Base.SSSP.DIJKSTRA:
+                raise Base.GraphException('Unknown SSSP engine ' + str(engine))
+            elif self._ssspTrees is not None:
+                dist, prev = self._cachedDistances(source, alg)
+                return alg.buildTree(prev)
+            else:
                 return alg.execute(source)
+
+        #returns the maps dist and prev of the shortest paths from source without building a Graph object
+        #only nodes reachable from source are contained, prev[source] is None
+        def distances(self, source):
+            if self._SSSP:
+                alg = Base.SSSP(self)
+                if self._report is None:
+                    return self._distances(source, alg)
+                start = time.perf_counter()
+                dist, prev = self._distances(source, alg)
+                self._report('distances', alg.counters(), time.perf_counter() - start)
+                return dist, prev
+            else:
+                raise Base.GraphException('SSSP disabled for this graph!')
+
+        def _distances(self, source, alg):
+            if self._ssspTrees is not None:
+                dist, prev = self._cachedDistances(source, alg)
+                return dict(dist), dict(prev)
+            return alg.distances(source)
+
+        #returns the cached (dist, prev) maps of source, computing them and evicting the least recently used source if needed
+        def _cachedDistances(self, source, alg):
+            if source in self._ssspTrees:
+                self._ssspTrees.move_to_end(source)
+                return self._ssspTrees[source]
+            result = alg.distances(source)
+            self._ssspTrees[source] = result
+            if len(self._ssspTrees) > self._SSSPCache:
+                self._ssspTrees.popitem(last = False)
+            return result
+
+        #computes the shortest path distances from every node in sources on a pool of worker processes
+        #the graph is sent to each worker once in CSR form, workers = None uses all cores, workers = 1 runs in this process
+        #returns a map source -> (node -> distance) of the reachable nodes, or with matrix = True a NumPy array
+        #the distances are ints only if every weight is an int (fitting int64), otherwise floats
+        #with one row per source and one column per node ID (inf for unreachable nodes)
+        #engine = "vectorized" relaxes all sources at once with NumPy in this process instead (workers is ignored)
+        def SSSPMany(self, sources, workers = None, matrix = False, engine = "dijkstra"):
+            if self._SSSP:
+                alg = Base.SSSP(self)
+                if self._report is None:
+                    return alg.executeMany(sources, workers, matrix, engine)
+                start = time.perf_counter()
+                result = alg.executeMany(sources, workers, matrix, engine)
+                self._report('SSSPMany', alg.counters(), time.perf_counter() - start)
+                return result
             else:
                 raise Base.GraphException('SSSP disabled for this graph!')
             
-    #class for the MST algorithm, uses kruskals algorithm 
+    #class for the MST algorithm, uses kruskals or prims algorithm
     class MST:
+        # "Constants"
+        KRUSKAL = "kruskal"
+        PRIM = "prim"
+        BORUVKA = "boruvka"
+        AUTO = "auto"
+        #AUTO uses prim from this edge density (edges / possible edges) on
+        DENSE = 0.1
+
         def __init__(self, graph):
             if graph.directed() or not graph.weighted():
                 raise Base.GraphException('MST works only for undirected weighted graphs')
             self._graph = graph
-            self._parent = dict()
-            self._rank = dict()
-
-        def _makeSet(self, node):
-            self._parent[node] = node
-            self._rank[node] = 0
+            self._sets = Base.DisjointSet()
+            self._counters = dict()
 
-        def _find(self, node):
-            if self._parent[node] != node:
-                self._parent[node] = self._find(self._parent[node])
-            return self._parent[node]
+        #returns the counters of the last execute call
+        def counters(self):
+            return self._counters
 
-        def _union(self, node1, node2):
-            root1 = self._find(node1)
-            root2 = self._find(node2)
+        #state of a worker process of boruvka: the (node1 IDs, node2 IDs, weights) buffers of the graph
+        _workerEdges = None
 
-            if root1 == root2:
-                return
-                
-            if self._rank[root1] < self._rank[root2]:
-                self._parent[root1] = root2
-            elif self._rank[root1] > self._rank[root2]:
-                self._parent[root2] = root1
+        def execute(self, algorithm = "kruskal", workers = None):
+            if algorithm == Base.MST.AUTO:
+                size = self._graph.size()
+                if size > 1 and self._graph.numEdges() >= Base.MST.DENSE * size * (size - 1) / 2:
+                    algorithm = Base.MST.PRIM
+                else:
+                    algorithm = Base.MST.KRUSKAL
+            if algorithm == Base.MST.KRUSKAL:
+                return self._kruskal()
+            elif algorithm == Base.MST.PRIM:
+                return self._prim()
+            elif algorithm == Base.MST.BORUVKA:
+                return self._boruvka(workers)
             else:
-                self._parent[root2] = root1
-                self._rank[root1] += 1 
+                raise Base.GraphException('Unknown MST algorithm!')
 
-        def execute(self):
+        #sorts all edges and adds them unless they close a cycle
+        def _kruskal(self):
             for node in self._graph.nodes():
-                self._makeSet(node)
+                self._sets.makeSet(node)
             mst = Base.Graph(directed = False, weighted = True, traversal = Base.Graph.DFS)
             edges = sorted(self._graph.edges(), key=methodcaller('weight'))
             for edge in edges:
-                if self._find(edge.node1()) is not self._find(edge.node2()):
-                    self._union(edge.node1(), edge.node2())
+                if self._sets.union(edge.node1(), edge.node2()):
                     mst.add(edge.node1(), edge.node2(), edge.weight())
+            self._counters = {'edgesSorted': len(edges), 'treeEdges': mst.numEdges()}
             return mst
 
+        #grows a tree from every not yet reached node with a binary heap of (weight, node ID, parent ID) entries
+        #works on the adjacency directly, so edges() is never materialised
+        def _prim(self):
+            nodes = self._graph.nodes()
+            nodeIDs = self._graph._nodeIDs
+            weightedNeighbours = self._graph._weightedNeighbours
+            mst = Base.Graph(directed = False, weighted = True, traversal = Base.Graph.DFS)
+            visited = set()
+            pushes = 0
+
+            for root in nodes:
+                if root in visited: continue
+                visited.add(root)
+                rootID = nodeIDs[root]
+                heap = [(weight, nodeIDs[neighbour], rootID) for neighbour, weight in weightedNeighbours(root)]
+                heapq.heapify(heap)
+                pushes += len(heap)
+                while heap:
+                    weight, nodeID, parentID = heapq.heappop(heap)
+                    node = nodes[nodeID]
+                    if node in visited: continue
+                    visited.add(node)
+                    mst.add(nodes[parentID], node, weight)
+                    for neighbour, weight in weightedNeighbours(node):
+                        if neighbour not in visited:
+                            heapq.heappush(heap, (weight, nodeIDs[neighbour], nodeID))
+                            pushes += 1
+            #every heap is popped until it is empty, so there are as many pops as pushes
+            self._counters = {'heapPushes': pushes, 'heapPops': pushes, 'treeEdges': mst.numEdges()}
+            return mst
+
+        #every round finds the cheapest edge leaving each component (in parallel chunks of the edge list)
+        #and contracts along these edges, ties are broken by node IDs so the result is deterministic
+        def _boruvka(self, workers):
+            if workers == None:
+                workers = os.cpu_count() or 1
+            nodes = self._graph.nodes()
+            nodeIDs = self._graph._nodeIDs
+            #every undirected edge once, from the smaller to the larger node ID, self-loops are dropped
+            node1IDs, node2IDs, weights = array('q'), array('q'), []
+            for nodeID, node in enumerate(nodes):
+                for neighbour, weight in self._graph._weightedNeighbours(node):
+                    if nodeIDs[neighbour] > nodeID:
+                        node1IDs.append(nodeID)
+                        node2IDs.append(nodeIDs[neighbour])
+                        weights.append(weight)
+            #weights that need a double array and were not all floats stay a list of the original objects,
+            #so the tree keeps int weights and huge ints are compared exactly
+            weightArray = Base.Graph._weightArray(weights)
+            if Base.Graph._intMarkers(weights, weightArray) is None:
+                weights = weightArray
+            edges = (node1IDs, node2IDs, weights)
+
+            for nodeID in range(len(nodes)):
+                self._sets.makeSet(nodeID)
+            mst = Base.Graph(directed = False, weighted = True, traversal = Base.Graph.DFS)
+            chunkSize = max(1, math.ceil(len(node1IDs) / workers))
+            chunks = [(start, min(start + chunkSize, len(node1IDs))) for start in range(0, len(node1IDs), chunkSize)]
+            pool = None
+            if workers > 1 and len(chunks) > 1:
+                pool = ProcessPoolExecutor(max_workers = workers, initializer = Base.MST._initWorker, initargs = edges)
+            rounds = 0
+            try:
+                while True:
+                    rounds += 1
+                    components = array('q', (self._sets.find(nodeID) for nodeID in range(len(nodes))))
+                    if pool is None:
+                        results = [Base.MST._cheapestEdges(*edges, components, start, end) for start, end in chunks]
+                    else:
+                        results = pool.map(Base.MST._runWorker, [components] * len(chunks), *zip(*chunks))
+                    cheapest = dict()
+                    for result in results:
+                        for component, candidate in result.items():
+                            if component not in cheapest or candidate < cheapest[component]:
+                                cheapest[component] = candidate
+                    if not cheapest:
+                        break
+                    for weight, node1ID, node2ID in cheapest.values():
+                        if self._sets.union(node1ID, node2ID):
+                            mst.add(nodes[node1ID], nodes[node2ID], weight)
+            finally:
+                if pool is not None:
+                    pool.shutdown()
+            self._counters = {'rounds': rounds, 'edges': len(node1IDs), 'chunks': len(chunks), 'treeEdges': mst.numEdges()}
+            return mst
+
+        @staticmethod
+        def _initWorker(node1IDs, node2IDs, weights):
+            Base.MST._workerEdges = (node1IDs, node2IDs, weights)
+
+        @staticmethod
+        def _runWorker(components, start, end):
+            return Base.MST._cheapestEdges(*Base.MST._workerEdges, components, start, end)
+
+        #returns component -> (weight, node1 ID, node2 ID) of the cheapest edge leaving the component in edges[start:end]
+        @staticmethod
+        def _cheapestEdges(node1IDs, node2IDs, weights, components, start, end):
+            cheapest = dict()
+            for i in range(start, end):
+                node1ID, node2ID = node1IDs[i], node2IDs[i]
+                component1, component2 = components[node1ID], components[node2ID]
+                if component1 == component2: continue
+                candidate = (weights[i], node1ID, node2ID)
+                if component1 not in cheapest or candidate < cheapest[component1]:
+                    cheapest[component1] = candidate
+                if component2 not in cheapest or candidate < cheapest[component2]:
+                    cheapest[component2] = candidate
+            return cheapest
+
     #class for SSSP, uses Dijkstras algorithm
     class SSSP:
         def __init__(self, graph):
             if not graph.directed() or not graph.weighted():
                 raise Base.GraphException('SSSP works only for directed, weighted graphs')
             self._graph = graph
-
-        def execute(self, source):
-            #Dijkstra
-            dist = dict()
-            prev = dict()
-            Q = list()
-
-            for node in self._graph.nodes():
-                dist[node] = math.inf
-                prev[node] = None
-                Q.append(node)
-
-            dist[source] = 0
-
-            while len(Q) != 0:
-                node = min(Q, key=dist.get)
-                Q.remove(node)
-
-                for neighbour in self._graph.getNeighbourhood(node):
-                    wEdge = self._graph.edge(node, neighbour)
-                    alt = dist[node] + wEdge.weight()
-                    if alt < dist[neighbour]:
+            self._counters = {'nodesExpanded': 0, 'edgesScanned': 0, 'edgesRelaxed': 0, 'heapPushes': 0, 'heapPops': 0}
+
+        #returns the counters summed over all runs of this object
+        def counters(self):
+            return self._counters
+
+        #engines: dijkstra on the node objects or NumPy Bellman-Ford on the adjacency matrix (needs NumPy)
+        DIJKSTRA = "dijkstra"
+        VECTORIZED = "vectorized"
+
+        #state of a worker process of executeMany: the (offsets, targets, weights) buffers of the graph
+        _workerCSR = None
+
+        def executeMany(self, sources, workers = None, matrix = False, engine = "dijkstra"):
+            sources = list(sources)
+            for source in sources:
+                if not self._graph.hasNode(source):
+                    raise Base.GraphException('Source not in graph!')
+            if engine not in (Base.SSSP.DIJKSTRA, Base.SSSP.VECTORIZED):
+                raise Base.GraphException('Unknown SSSP engine ' + str(engine))
+            if (matrix or engine == Base.SSSP.VECTORIZED) and np is None:
+                raise Base.GraphException('NumPy is required for matrix results and the vectorized engine!')
+            if engine == Base.SSSP.VECTORIZED:
+                dist = self._vectorizedDistances([self._graph.nodeID(source) for source in sources])
+                if matrix:
+                    return dist
+                toWeight = int if self._graph.adjacencyMatrix()[2].dtype.kind == 'i' else float
+                nodes = self._graph.nodes()
+                result = dict()
+                for source, row in zip(sources, dist):
+                    result[source] = {nodes[nodeID]: toWeight(row[nodeID]) for nodeID in np.flatnonzero(row != np.inf)}
+                return result
+            if workers == None:
+                workers = os.cpu_count() or 1
+
+            graph = self._graph
+            if graph.representation() != Base.Graph.CSR:
+                graph = graph.freeze()
+            csr = (graph._offsets, graph._targets, graph._weights)
+            sourceIDs = [graph.nodeID(source) for source in sources]
+
+            if workers == 1 or len(sourceIDs) <= 1:
+                rows = [Base.SSSP._csrDistances(*csr, sourceID) for sourceID in sourceIDs]
+            else:
+                #a few chunks per worker keep the pool busy without sending every source separately
+                chunkSize = max(1, len(sourceIDs) // (workers * 4))
+                chunks = [sourceIDs[i:i + chunkSize] for i in range(0, len(sourceIDs), chunkSize)]
+                #memoryviews of a mapped snapshot cannot be pickled, the workers get copies
+                csr = tuple(array(values.format, values.tobytes()) if isinstance(values, memoryview) else values for values in csr)
+                with ProcessPoolExecutor(max_workers = workers, initializer = Base.SSSP._initWorker, initargs = csr) as pool:
+                    rows = [row for chunk in pool.map(Base.SSSP._runWorker, chunks) for row in chunk]
+
+            self._counters['sources'] = self._counters.get('sources', 0) + len(sourceIDs)
+            if matrix:
+                return np.array([np.frombuffer(row, dtype = np.float64) for row in rows]).reshape(len(rows), graph.size())
+            #only a graph with int weights only gives int distances (like distances() does),
+            #with mixed weights the distances are floats even on paths that only use int weights
+            toWeight = int if Base.Graph._typecode(graph._weights) == 'q' else float
+            nodes = graph.nodes()
+            result = dict()
+            for source, row in zip(sources, rows):
+                result[source] = {nodes[nodeID]: toWeight(d) for nodeID, d in enumerate(row) if d != math.inf}
+            return result
+
+        @staticmethod
+        def _initWorker(offsets, targets, weights):
+            Base.SSSP._workerCSR = (offsets, targets, weights)
+
+        @staticmethod
+        def _runWorker(sourceIDs):
+            return [Base.SSSP._csrDistances(*Base.SSSP._workerCSR, sourceID) for sourceID in sourceIDs]
+
+        #Dijkstra on CSR buffers, returns the distances indexed by node ID as an array of doubles (inf if unreachable)
+        @staticmethod
+        def _csrDistances(offsets, targets, weights, sourceID):
+            dist = array('d', [math.inf]) * (len(offsets) - 1)
+            dist[sourceID] = 0
+            heap = [(0, sourceID)]
+            while heap:
+                d, nodeID = heapq.heappop(heap)
+                if d > dist[nodeID]:
+                    continue
+                for i in range(offsets[nodeID], offsets[nodeID + 1]):
+                    alt = d + weights[i]
+                    targetID = targets[i]
+                    if alt < dist[targetID]:
+                        dist[targetID] = alt
+                        heapq.heappush(heap, (alt, targetID))
+            return dist
+
+        #Dijkstra with a binary heap (lazy deletion), returns the dist and prev maps of all nodes reachable from source
+        def distances(self, source):
+            if not self._graph.hasNode(source):
+                raise Base.GraphException('Source not in graph!')
+            dist = {source: 0}
+            prev = {source: None}
+            self._relax(dist, prev, [(0, self._graph.nodeID(source))])
+            return dist, prev
+
+        #repairs the dist and prev maps of a source after the edge m -> n was inserted
+        #only the region whose distances improve is visited by a Dijkstra restarted from n
+        def insertEdge(self, dist, prev, m, n, weight):
+            if m not in dist:
+                return
+            alt = dist[m] + weight
+            if alt < dist.get(n, math.inf):
+                dist[n] = alt
+                prev[n] = m
+                self._relax(dist, prev, [(alt, self._graph.nodeID(n))])
+
+        #runs Dijkstra from the (distance, node ID) entries of heap, only improvements of dist are followed
+        def _relax(self, dist, prev, heap):
+            nodes = self._graph.nodes()
+            nodeIDs = self._graph._nodeIDs
+            pushes = len(heap)
+            expanded = scanned = relaxed = 0
+            while heap:
+                d, nodeID = heapq.heappop(heap)
+                node = nodes[nodeID]
+                #skip stale heap entries
+                if d > dist[node]:
+                    continue
+
+                neighbours = self._graph._weightedNeighbours(node)
+                expanded += 1
+                scanned += len(neighbours)
+                for neighbour, weight in neighbours:
+                    alt = d + weight
+                    if alt < dist.get(neighbour, math.inf):
                         dist[neighbour] = alt
                         prev[neighbour] = node
+                        heapq.heappush(heap, (alt, nodeIDs[neighbour]))
+                        relaxed += 1
+            #the heap is popped until it is empty, so there are as many pops as pushes
+            pushes += relaxed
+            counters = self._counters
+            counters['nodesExpanded'] += expanded
+            counters['edgesScanned'] += scanned
+            counters['edgesRelaxed'] += relaxed
+            counters['heapPushes'] += pushes
+            counters['heapPops'] += pushes
 
-            #Create graph from dist and prev
+        def execute(self, source):
+            dist, prev = self.distances(source)
+            return self.buildTree(prev)
+
+        #shortest path tree from source with the vectorized engine
+        def executeVectorized(self, source):
+            if np is None:
+                raise Base.GraphException('NumPy is required for the vectorized engine!')
+            if not self._graph.hasNode(source):
+                raise Base.GraphException('Source not in graph!')
+            sourceID = self._graph.nodeID(source)
+            dist = self._vectorizedDistances([sourceID])[0]
+
+            #prev comes from the tight edges (dist[u] + w == dist[v]), a BFS over them from source gives a tree
+            #even if zero weight cycles make some tight edges point backwards
+            indptr, indices, data = self._graph.adjacencyMatrix()
+            nodes = self._graph.nodes()
+            parent = np.full(len(nodes), -1, dtype = np.int64)
+            parent[sourceID] = sourceID
+            frontier = np.array([sourceID], dtype = np.int64)
+            prev = {source: None}
+            while len(frontier) > 0:
+                positions = Base.Graph._rowPositions(indptr, frontier)
+                sourceIDs = np.repeat(frontier, indptr[frontier + 1] - indptr[frontier])
+                targets = indices[positions]
+                keep = (parent[targets] < 0) & (dist[sourceIDs] + data[positions] == dist[targets])
+                #the first tight edge into a node wins
+                targets, first = np.unique(targets[keep], return_index = True)
+                parents = sourceIDs[keep][first]
+                parent[targets] = parents
+                for targetID, parentID in zip(targets.tolist(), parents.tolist()):
+                    prev[nodes[targetID]] = nodes[parentID]
+                frontier = targets
+            return self.buildTree(prev)
+
+        #Bellman-Ford for all sourceIDs at once on the adjacency matrix, returns a (sources x nodes) float array (inf if unreachable)
+        #every round relaxes the edges leaving the nodes that improved in the previous round with np.minimum.at
+        #and stops as soon as no distance changes (at most V - 1 rounds as weights are non-negative)
+        def _vectorizedDistances(self, sourceIDs):
+            indptr, indices, data = self._graph.adjacencyMatrix()
+            numNodes = len(indptr) - 1
+            sourceIDs = np.array(sourceIDs, dtype = np.int64)
+            rows = np.arange(len(sourceIDs))
+            dist = np.full((len(sourceIDs), numNodes), np.inf)
+            dist[rows, sourceIDs] = 0
+            weights = data.astype(np.float64)
+            active = np.zeros(numNodes, dtype = bool)
+            active[sourceIDs] = True
+            rounds = scanned = 0
+            while active.any():
+                rounds += 1
+                frontier = np.flatnonzero(active)
+                positions = Base.Graph._rowPositions(indptr, frontier)
+                edgeSources = np.repeat(frontier, indptr[frontier + 1] - indptr[frontier])
+                edgeTargets = indices[positions]
+                scanned += len(positions) * len(sourceIDs)
+                candidates = dist[:, edgeSources] + weights[positions]
+                relaxed = dist.copy()
+                np.minimum.at(relaxed, (slice(None), edgeTargets), candidates)
+                active = (relaxed < dist).any(axis = 0)
+                dist = relaxed
+            self._counters['rounds'] = self._counters.get('rounds', 0) + rounds
+            self._counters['edgesScanned'] += scanned
+            self._counters['sources'] = self._counters.get('sources', 0) + len(sourceIDs)
+            return dist
+
+        #creates the shortest path tree from prev, nodes are visited in graph order
+        def buildTree(self, prev):
             G = Base.Graph(directed = True, weighted = True, traversal = Base.Graph.DFS)
-            for node, prev in prev.items():
-                if prev == None: continue
-                wEdge = self._graph.edge(prev, node)
+            for node in self._graph.nodes():
+                prevNode = prev.get(node)
+                if prevNode is None: continue
+                wEdge = self._graph._edge(prevNode, node)
                 G.add(wEdge.node1(), wEdge.node2(), wEdge.weight())
 
             return G
@@ -908,6 +2561,18 @@ class Test(unittest.TestCase):
         G.add(n5, n2, 1)
         self.assertEqual(len(G.edges()), 5)
 
+        #undirected self loops are stored twice, but returned once
+        U = Base.Graph(representation = Base.Graph.NEIGHBOUR)
+        m1, m2 = Base.Node(), Base.Node()
+        U.add(m1, m1)
+        U.add(m1, m2)
+        self.assertEqual(len(U.edges()), U.numEdges())
+        self.assertEqual([(edge.node1(), edge.node2()) for edge in U.edges()], [(m1, m1), (m1, m2)])
+        self.assertEqual(len(U.freeze().edges()), 2)
+        #DOTprint keeps printing both stored entries of the self loop
+        self.assertEqual(U.DOTprint(), "graph g{\nnode[label=\"\"]; \n0 -- 0\n0 -- 0\n0 -- 1\n}")
+        self.assertEqual(U.freeze().DOTprint(), U.DOTprint())
+
     def test_MST(self):
         with self.assertRaises(Base.GraphException):
             G = Base.Graph(MST = True)
@@ -1041,6 +2706,718 @@ class Test(unittest.TestCase):
             if node is startNode: continue
             self.assertEqual(SSSP.search(startNode, node), True)
 
+    def test_nodeRegistry(self):
+        G = Base.Graph()
+        n1, n2, n3, n4 = Base.Node(), Base.Node(), Base.Node(), Base.Node()
+        G.add(n3, n1)
+        G.add(n1, n2)
+        G.add(n2, n3)
+        #IDs follow insertion order
+        self.assertEqual(G.nodes(), [n3, n1, n2])
+        self.assertEqual([G.nodeID(n) for n in G.nodes()], [0, 1, 2])
+        self.assertEqual(G.hasNode(n1), True)
+        self.assertEqual(G.hasNode(n4), False)
+        self.assertRaises(ValueError, G.nodeID, n4)
+
+    def test_edgeIndex(self):
+        n1, n2, n3 = Base.Node(), Base.Node(), Base.Node()
+        #undirected: lookup works in both directions and returns the internal edge
+        G = Base.Graph(weighted = True)
+        e1 = G.add(n1, n2, 4)
+        self.assertEqual(G.edge(n1, n2) is e1, True)
+        self.assertEqual(G.edge(n2, n1) is e1, True)
+        self.assertEqual(G.add(n2, n1, 9) is e1, True)
+        self.assertEqual(G.hasEdge(n2, n1), True)
+        self.assertEqual(G.hasEdge(n1, n3), False)
+        self.assertEqual(G.edge(n1, n3), None)
+        #directed: direction matters
+        G = Base.Graph(directed = True)
+        e1 = G.add(n1, n2)
+        self.assertEqual(G.hasEdge(n1, n2), True)
+        self.assertEqual(G.hasEdge(n2, n1), False)
+        e2 = G.add(n2, n1)
+        self.assertEqual(G.edge(n2, n1) is e2, True)
+        self.assertEqual(G.numEdges(), 2)
+        #neighbour representation
+        G = Base.Graph(directed = True, representation = Base.Graph.NEIGHBOUR)
+        G.add(n1, n2)
+        self.assertEqual(G.hasEdge(n1, n2), True)
+        self.assertEqual(G.hasEdge(n2, n1), False)
+
+    def test_adjacency(self):
+        for repr in (Base.Graph.EDGE, Base.Graph.NEIGHBOUR):
+            n1, n2, n3, n4 = Base.Node(), Base.Node(), Base.Node(), Base.Node()
+            G = Base.Graph(directed = True, representation = repr)
+            G.add(n1, n2)
+            G.add(n1, n3)
+            G.add(n3, n2)
+            G.add(n4, n4)
+            self.assertEqual(G.getNeighbourhood(n1), [n2, n3])
+            self.assertEqual(G.getNeighbourhood(n2), [])
+            self.assertEqual(G.predecessors(n2), [n1, n3])
+            self.assertEqual(G.predecessors(n1), [])
+            self.assertEqual(G.predecessors(n4), [n4])
+            #index follows later insertions
+            G.add(n2, n1)
+            self.assertEqual(G.predecessors(n1), [n2])
+            self.assertRaises(Base.GraphException, G.predecessors, Base.Node())
+
+        G = Base.Graph()
+        n1, n2, n3 = Base.Node(), Base.Node(), Base.Node()
+        G.add(n1, n2)
+        G.add(n3, n1)
+        G.add(n3, n3)
+        self.assertEqual(G.getNeighbourhood(n1), [n2, n3])
+        self.assertEqual(G.predecessors(n1), [n2, n3])
+        self.assertEqual(G.getNeighbourhood(n3), [n1, n3])
+
+    def test_distances(self):
+        for repr in (Base.Graph.EDGE, Base.Graph.NEIGHBOUR):
+            G = Base.Graph(weighted = True, SSSP = True, directed = True, representation = repr)
+            n0, n1, n2, n3, n4 = Base.Node(), Base.Node(), Base.Node(), Base.Node(), Base.Node()
+            G.add(n0, n1, 4)
+            G.add(n0, n2, 1)
+            G.add(n2, n1, 2)
+            G.add(n1, n3, 5)
+            G.add(n4, n0, 1)
+            dist, prev = G.distances(n0)
+            self.assertEqual(dist, {n0: 0, n1: 3, n2: 1, n3: 8})
+            self.assertEqual(prev, {n0: None, n1: n2, n2: n0, n3: n1})
+            self.assertRaises(Base.GraphException, G.distances, Base.Node())
+
+        G = Base.Graph(weighted = True, directed = True)
+        G.add(n0, n1, 4)
+        self.assertRaises(Base.GraphException, G.distances, n0)
+
+    def test_CSR(self):
+        n1, n2, n3, n4, n5, n6, n7, n8 = Base.Node(), Base.Node(), Base.Node(), Base.Node(), Base.Node(), Base.Node(), Base.Node(), Base.Node()
+        G = Base.Graph(directed = False, weighted = True, traversal = Base.Graph.BFS)
+        G.add(n1, n2, 1)
+        G.add(n1, n3, 4)
+        G.add(n1, n4, 5)
+        G.add(n1, n5, 1)
+        G.add(n5, n6, 10)
+        G.add(n5, n7, 2)
+        G.add(n5, n8, 7)
+        C = G.freeze()
+        self.assertEqual(C.representation(), Base.Graph.CSR)
+        self.assertEqual(C.nodes(), G.nodes())
+        self.assertEqual(C.numEdges(), 7)
+        self.assertEqual(len(C.edges()), 7)
+        self.assertEqual(C.DOTprint(), G.DOTprint())
+        self.assertEqual(C.getNeighbourhood(n5), [n1, n6, n7, n8])
+        self.assertEqual(C.edge(n6, n5).weight(), 10)
+        self.assertEqual(C.edge(n6, n7), None)
+        self.assertEqual(C.search(n2, n8), True)
+        self.assertRaises(Base.GraphException, C.add, n2, n8, 1)
+        #non-integer weights switch to a float buffer, int weights stay ints
+        G.add(n2, n3, 0.5)
+        C = G.freeze()
+        self.assertEqual(C.edge(n3, n2).weight(), 0.5)
+        self.assertIs(type(C.edge(n1, n2).weight()), int)
+        self.assertEqual(sorted(C.DOTprint().splitlines()), sorted(G.DOTprint().splitlines()))
+        self.assertEqual(G.toRepresentation(Base.Graph.CSR).toRepresentation(Base.Graph.EDGE).DOTprint(), C.DOTprint())
+
+        #directed, SSSP and predecessors
+        G = Base.Graph(weighted = True, SSSP = True, directed = True, representation = Base.Graph.NEIGHBOUR)
+        G.add(n1, n2, 5)
+        G.add(n2, n1, 1)
+        G.add(n1, n3, 20)
+        G.add(n1, n4, 3)
+        G.add(n3, n5, 6)
+        G.add(n3, n4, 15)
+        G.add(n4, n5, 1)
+        C = G.freeze()
+        self.assertEqual(C.DOTprint(), G.DOTprint())
+        self.assertEqual(C.numEdges(), 7)
+        self.assertEqual(C.predecessors(n4), [n1, n3])
+        self.assertEqual(C.distances(n1), G.distances(n1))
+        SSSP = C.SSSP(n1)
+        self.assertEqual(SSSP.numEdges(), 4)
+        self.assertEqual(sum(edge.weight() for edge in SSSP.edges()), 29)
+
+        #MST
+        G = Base.Graph(weighted = True, MST = True)
+        G.add(n1, n2, 7)
+        G.add(n1, n4, 5)
+        G.add(n2, n3, 8)
+        G.add(n2, n4, 9)
+        G.add(n3, n4, 4)
+        MST = G.freeze().MST()
+        self.assertEqual(MST.numEdges(), 3)
+        self.assertEqual(sum(edge.weight() for edge in MST.edges()), 16)
+
+    def test_addEdges(self):
+        for repr in (Base.Graph.EDGE, Base.Graph.NEIGHBOUR):
+            n1, n2, n3, n4 = Base.Node(), Base.Node(), Base.Node(), Base.Node()
+            G = Base.Graph(weighted = True, representation = repr)
+            G.add(n1, n2, 1)
+            #duplicates against the graph and within the batch are skipped, generators are accepted
+            batch = ((m, n, w) for m, n, w in [(n2, n1, 5), (n2, n3, 2), (n3, n2, 7), (n3, n4, 3)])
+            self.assertEqual(G.addEdges(batch), 2)
+            self.assertEqual(G.numEdges(), 3)
+            self.assertEqual(G.edge(n2, n3).weight(), 2)
+            self.assertEqual(G.DOTprint(), "graph g{\nnode[label=\"\"]; \n" \
+                             "0 -- 1 [ label = \"1\" ];\n" \
+                             "1 -- 2 [ label = \"2\" ];\n" \
+                             "2 -- 3 [ label = \"3\" ];\n" \
+                             "}")
+            self.assertRaises(Base.GraphException, G.addEdges, [(n1, n4)])
+            self.assertRaises(Base.GraphException, G.addEdges, [(n1, n4, -1)])
+
+            #trusted input
+            n5, n6 = Base.Node(), Base.Node()
+            G = Base.Graph(directed = True, representation = repr, traversal = Base.Graph.BFS)
+            self.assertEqual(G.addEdges([(n5, n6), (n6, n5)], trusted = True), 2)
+            self.assertEqual(G.numEdges(), 2)
+            self.assertEqual(G.hasEdge(n6, n5), True)
+            self.assertEqual(G.search(n6, n5), True)
+
+        G = Base.Graph(representation = Base.Graph.NEIGHBOUR)
+        self.assertRaises(TypeError, G.addEdges, [(1, 2)])
+
+    def test_writeDOT(self):
+        n1, n2, n3, n4 = Base.Node(), Base.Node(), Base.Node(), Base.Node()
+        G = Base.Graph(weighted = True, representation = Base.Graph.NEIGHBOUR)
+        G.add(n1, n2, 1)
+        G.add(n3, n2, 4)
+        G.add(n3, n4, 2)
+        G.add(n4, n1, 8)
+        expected = "graph g{\nnode[label=\"\"]; \n" \
+                   "0 -- 1 [ label = \"1\" ];\n" \
+                   "0 -- 3 [ label = \"8\" ];\n" \
+                   "1 -- 2 [ label = \"4\" ];\n" \
+                   "2 -- 3 [ label = \"2\" ];\n" \
+                   "}"
+        self.assertEqual(G.DOTprint(), expected)
+        self.assertEqual("".join(G.iterDOT()), expected)
+        out = io.StringIO()
+        G.writeDOT(out)
+        self.assertEqual(out.getvalue(), expected)
+        out = io.BytesIO()
+        G.writeDOT(out, compress = True)
+        self.assertEqual(gzip.decompress(out.getvalue()).decode('utf-8'), expected)
+
+        G = Base.Graph(printable = False)
+        G.add(n1, n2)
+        self.assertRaises(Base.GraphException, G.iterDOT)
+        self.assertRaises(Base.GraphException, G.writeDOT, io.StringIO())
+
+    def test_traversalIterators(self):
+        for repr in (Base.Graph.EDGE, Base.Graph.NEIGHBOUR):
+            G = Base.Graph(directed = True, representation = repr)
+            n1, n2, n3, n4, n5, n6 = Base.Node(), Base.Node(), Base.Node(), Base.Node(), Base.Node(), Base.Node()
+            G.add(n1, n2)
+            G.add(n1, n3)
+            G.add(n2, n4)
+            G.add(n3, n4)
+            G.add(n4, n5)
+            G.add(n6, n1)
+            self.assertEqual(list(G.bfs(n1)), [n1, n2, n3, n4, n5])
+            self.assertEqual(list(G.dfs(n1)), [n1, n3, n4, n5, n2])
+            self.assertEqual(list(G.bfs(n1, details = True)),
+                             [(n1, 0, None), (n2, 1, n1), (n3, 1, n1), (n4, 2, n2), (n5, 3, n4)])
+            self.assertEqual(list(G.dfs(n5, details = True)), [(n5, 0, None)])
+            #n4 is reached through n3 first, so n2 -> n4 is no tree edge
+            self.assertEqual(list(G.dfs(n1, details = True)),
+                             [(n1, 0, None), (n3, 1, n1), (n4, 2, n3), (n5, 3, n4), (n2, 1, n1)])
+            #the edge c -> b makes b a child of c, not of a
+            a, b, c = Base.Node(), Base.Node(), Base.Node()
+            D = Base.Graph(directed = True, representation = repr)
+            D.addEdges([(a, b), (a, c), (c, b)])
+            self.assertEqual(list(D.dfs(a, details = True)), [(a, 0, None), (c, 1, a), (b, 2, c)])
+            #generators are lazy
+            it = G.bfs(n6)
+            self.assertEqual(next(it), n6)
+            self.assertEqual(next(it), n1)
+            self.assertRaises(Base.GraphException, G.bfs, Base.Node())
+
+        store = Base.TraversalStore(Base.Graph.BFS)
+        store.add(1)
+        store.add(2)
+        self.assertEqual(store.all(), [1, 2])
+        self.assertEqual(store.get(), 1)
+        self.assertEqual(store.empty(), False)
+
+    def test_bidirectionalSearch(self):
+        for repr in (Base.Graph.EDGE, Base.Graph.NEIGHBOUR):
+            G = Base.Graph(directed = True, traversal = Base.Graph.BIDIRECTIONAL, representation = repr)
+            self.assertEqual(G.traversal(), Base.Graph.BIDIRECTIONAL)
+            n1, n2, n3, n4, n5, n6, n7, n8, n9 = Base.Node(), Base.Node(), Base.Node(), Base.Node(), Base.Node(), Base.Node(), Base.Node(), Base.Node(), Base.Node()
+            G.add(n1, n2)
+            G.add(n1, n3)
+            G.add(n2, n4)
+            G.add(n4, n5)
+            G.add(n4, n6)
+            G.add(n4, n7)
+            G.add(n7, n3)
+            G.add(n7, n8)
+            G.add(n9, n9)
+            self.assertEqual(G.search(n1, n4), True)
+            self.assertEqual(G.search(n3, n1), False)
+            self.assertEqual(G.search(n4, n8), True)
+            self.assertEqual(G.search(n1, n8), True)
+            self.assertEqual(G.search(n1, n9), False)
+            self.assertEqual(G.search(n9, n9), True)
+            self.assertEqual(G.search(n8, n3), False)
+            self.assertRaises(Base.GraphException, G.search, n1, Base.Node())
+            self.assertEqual(G.freeze().search(n1, n8), True)
+            self.assertEqual(G.freeze().search(n3, n1), False)
+
+        G = Base.Graph()
+        G.setTraversal(Base.Graph.BIDIRECTIONAL)
+        G.add(n1, n2)
+        G.add(n3, n2)
+        G.add(n4, n5)
+        self.assertEqual(G.search(n1, n3), True)
+        self.assertEqual(G.search(n3, n1), True)
+        self.assertEqual(G.search(n1, n5), False)
+        self.assertEqual(G.freeze().search(n1, n3), True)
+
+    def test_components(self):
+        with self.assertRaises(Base.GraphException):
+            G = Base.Graph(directed = True, components = True)
+        G = Base.Graph()
+        self.assertRaises(Base.GraphException, G.numComponents)
+
+        for repr in (Base.Graph.EDGE, Base.Graph.NEIGHBOUR):
+            G = Base.Graph(components = True, traversal = Base.Graph.BFS, representation = repr)
+            n1, n2, n3, n4, n5, n6 = Base.Node(), Base.Node(), Base.Node(), Base.Node(), Base.Node(), Base.Node()
+            G.add(n1, n2)
+            G.add(n3, n4)
+            G.add(n5, n5)
+            self.assertEqual(G.numComponents(), 3)
+            self.assertEqual(G.connected(n2, n1), True)
+            self.assertEqual(G.connected(n1, n3), False)
+            self.assertEqual(G.search(n1, n4), False)
+            G.addEdges([(n2, n3), (n4, n6)])
+            self.assertEqual(G.numComponents(), 2)
+            self.assertEqual(G.connected(n1, n6), True)
+            self.assertEqual(G.componentOf(n6) is G.componentOf(n1), True)
+            self.assertEqual(G.search(n1, n4), True)
+            self.assertEqual(G.search(n1, n5), False)
+            self.assertRaises(Base.GraphException, G.connected, n1, Base.Node())
+            self.assertEqual(G.freeze().numComponents(), 2)
+
+    def test_SCC(self):
+        with self.assertRaises(Base.GraphException):
+            G = Base.Graph(SCC = True)
+
+        for repr in (Base.Graph.EDGE, Base.Graph.NEIGHBOUR):
+            G = Base.Graph(directed = True, SCC = True, traversal = Base.Graph.DFS, representation = repr)
+            n1, n2, n3, n4, n5, n6, n7 = Base.Node(), Base.Node(), Base.Node(), Base.Node(), Base.Node(), Base.Node(), Base.Node()
+            G.add(n1, n2)
+            G.add(n2, n3)
+            G.add(n3, n1)
+            G.add(n3, n4)
+            G.add(n4, n5)
+            G.add(n5, n4)
+            G.add(n6, n6)
+            components = G.scc()
+            self.assertEqual(sorted(len(component) for component in components), [1, 2, 3])
+            self.assertEqual(set(components[0]), {n4, n5})
+            self.assertEqual(set(components[1]), {n1, n2, n3})
+            self.assertEqual(G.search(n2, n1), True)
+            self.assertEqual(G.search(n1, n5), True)
+            self.assertEqual(G.search(n5, n1), False)
+            self.assertEqual(G.search(n6, n6), True)
+            self.assertEqual(G.search(n1, n6), False)
+            #the index is rebuilt after add
+            G.add(n5, n6)
+            G.add(n7, n1)
+            self.assertEqual(G.search(n1, n6), True)
+            self.assertEqual(G.search(n7, n6), True)
+            self.assertEqual(G.search(n6, n7), False)
+            G.add(n5, n1)
+            self.assertEqual(G.search(n5, n2), True)
+            self.assertEqual(len(G.scc()), 3)
+
+        #long chains do not hit the recursion limit
+        G = Base.Graph(directed = True)
+        nodes = [Base.Node() for i in range(5000)]
+        G.addEdges(zip(nodes, nodes[1:]))
+        G.add(nodes[-1], nodes[0])
+        self.assertEqual(len(G.scc()), 1)
+
+    def test_reachability(self):
+        for repr in (Base.Graph.EDGE, Base.Graph.NEIGHBOUR):
+            G = Base.Graph(directed = True, representation = repr, traversal = Base.Graph.BFS)
+            n = [Base.Node() for i in range(8)]
+            G.add(n[0], n[1])
+            G.add(n[1], n[2])
+            G.add(n[2], n[0])
+            G.add(n[2], n[3])
+            G.add(n[3], n[4])
+            G.add(n[5], n[4])
+            G.add(n[6], n[6])
+            G.add(n[7], n[5])
+            self.assertEqual(G.reachabilityMemory() > 0, True)
+            G.buildReachability()
+            for a in n:
+                for b in n:
+                    self.assertEqual(G.reachable(a, b), G.search(a, b))
+            #rebuilt after add
+            G.add(n[4], n[7])
+            self.assertEqual(G.reachable(n[0], n[5]), True)
+            self.assertEqual(G.reachable(n[5], n[0]), False)
+            self.assertRaises(Base.GraphException, G.reachable, n[0], Base.Node())
+
+    def test_SSSPMany(self):
+        for repr in (Base.Graph.EDGE, Base.Graph.NEIGHBOUR):
+            G = Base.Graph(weighted = True, SSSP = True, directed = True, representation = repr)
+            n = [Base.Node() for i in range(6)]
+            G.add(n[0], n[1], 5)
+            G.add(n[1], n[0], 1)
+            G.add(n[0], n[2], 20)
+            G.add(n[0], n[3], 3)
+            G.add(n[2], n[4], 6)
+            G.add(n[3], n[4], 1)
+            G.add(n[4], n[5], 3)
+            expected = {source: G.distances(source)[0] for source in n}
+            self.assertEqual(G.SSSPMany(n, workers = 1), expected)
+            self.assertEqual(G.SSSPMany(n, workers = 2), expected)
+            self.assertEqual(G.freeze().SSSPMany(n[:2], workers = 1), {n[0]: expected[n[0]], n[1]: expected[n[1]]})
+            self.assertRaises(Base.GraphException, G.SSSPMany, [Base.Node()])
+
+            #mixed int and float weights give float distances
+            G.add(n[5], n[0], 0.5)
+            result = G.SSSPMany(n[:1], workers = 1)[n[0]]
+            self.assertEqual(result, G.distances(n[0])[0])
+            self.assertEqual(set(type(d) for d in result.values()), {float})
+
+    @unittest.skipIf(np is None, 'NumPy not installed')
+    def test_SSSPManyMatrix(self):
+        G = Base.Graph(weighted = True, SSSP = True, directed = True)
+        n1, n2, n3 = Base.Node(), Base.Node(), Base.Node()
+        G.add(n1, n2, 2)
+        G.add(n2, n3, 0.5)
+        D = G.SSSPMany([n1, n3], workers = 1, matrix = True)
+        self.assertEqual(D.shape, (2, 3))
+        self.assertEqual(D[0].tolist(), [0, 2, 2.5])
+        self.assertEqual(D[1].tolist(), [math.inf, math.inf, 0])
+
+    def test_MSTAlgorithms(self):
+        for repr in (Base.Graph.EDGE, Base.Graph.NEIGHBOUR):
+            G = Base.Graph(weighted = True, MST = True, representation = repr)
+            n1, n2, n3, n4, n5, n6, n7, n8, n9 = Base.Node(), Base.Node(), Base.Node(), Base.Node(), Base.Node(), Base.Node(), Base.Node(), Base.Node(), Base.Node()
+            G.add(n1, n2, 7)
+            G.add(n1, n4, 5)
+            G.add(n2, n3, 8)
+            G.add(n2, n4, 9)
+            G.add(n2, n5, 7)
+            G.add(n3, n5, 5)
+            G.add(n4, n5, 15)
+            G.add(n4, n6, 6)
+            G.add(n5, n6, 8)
+            G.add(n5, n7, 9)
+            G.add(n6, n7, 11)
+            #second component
+            G.add(n8, n9, 2)
+            for algorithm in (Base.MST.KRUSKAL, Base.MST.PRIM, Base.MST.BORUVKA, Base.MST.AUTO):
+                MST = G.MST(algorithm, workers = 1)
+                self.assertEqual(MST.numEdges(), 7)
+                self.assertEqual(MST.weighted(), True)
+                self.assertEqual(MST.directed(), False)
+                self.assertEqual(sum(edge.weight() for edge in MST.edges()), 41)
+            self.assertRaises(Base.GraphException, G.MST, "unknown")
+            #mixed int and float weights come back unchanged from all algorithms
+            M = Base.Graph(weighted = True, MST = True, representation = repr)
+            m1, m2, m3, m4 = Base.Node(), Base.Node(), Base.Node(), Base.Node()
+            M.addEdges([(m1, m2, 4), (m2, m3, 0.5), (m3, m1, 9), (m3, m4, 2 ** 64 + 1), (m4, m1, 2 ** 64 + 2)])
+            for algorithm in (Base.MST.KRUSKAL, Base.MST.PRIM, Base.MST.BORUVKA):
+                T = M.MST(algorithm, workers = 1)
+                self.assertEqual(sorted(str(edge.weight()) for edge in T.edges()), sorted(['4', '0.5', str(2 ** 64 + 1)]))
+            #parallel boruvka gives the same (tie-broken) tree
+            MST = G.MST(Base.MST.BORUVKA, workers = 3)
+            self.assertEqual(sum(edge.weight() for edge in MST.edges()), 41)
+            self.assertEqual(MST.DOTprint(), G.MST(Base.MST.BORUVKA, workers = 1).DOTprint())
+
+    def test_incrementalMST(self):
+        with self.assertRaises(Base.GraphException):
+            G = Base.Graph(weighted = True, incrementalMST = True)
+
+        for repr in (Base.Graph.EDGE, Base.Graph.NEIGHBOUR):
+            G = Base.Graph(weighted = True, MST = True, incrementalMST = True, representation = repr)
+            n1, n2, n3, n4, n5, n6 = Base.Node(), Base.Node(), Base.Node(), Base.Node(), Base.Node(), Base.Node()
+            G.add(n1, n2, 7)
+            G.add(n2, n3, 8)
+            G.add(n1, n3, 9)
+            self.assertEqual(sum(edge.weight() for edge in G.MST().edges()), 15)
+            #lighter edge replaces the heaviest edge on the cycle
+            G.add(n3, n4, 2)
+            G.add(n4, n1, 1)
+            MST = G.MST()
+            self.assertEqual(MST.numEdges(), 3)
+            self.assertEqual(sum(edge.weight() for edge in MST.edges()), 10)
+            #heavier edge is ignored, new components are linked
+            G.add(n2, n4, 20)
+            G.add(n5, n6, 3)
+            MST = G.MST()
+            self.assertEqual(MST.numEdges(), 4)
+            self.assertEqual(sum(edge.weight() for edge in MST.edges()), 13)
+            G.add(n6, n2, 4)
+            #maintained tree matches a full recomputation
+            MST = G.MST()
+            self.assertEqual(sum(edge.weight() for edge in MST.edges()),
+                             sum(edge.weight() for edge in Base.MST(G).execute().edges()))
+            self.assertEqual(MST.numEdges(), 5)
+            #the rooted forest stays consistent after swaps and links
+            for node, parent in G._mstParent.items():
+                self.assertEqual(G._mstDepth[node], 0 if parent is None else G._mstDepth[parent] + 1)
+                if parent is not None:
+                    self.assertIn(parent, G._mstTree[node])
+
+    def test_SSSPCache(self):
+        with self.assertRaises(Base.GraphException):
+            G = Base.Graph(weighted = True, directed = True, SSSPCache = 2)
+
+        for repr in (Base.Graph.EDGE, Base.Graph.NEIGHBOUR):
+            G = Base.Graph(weighted = True, SSSP = True, directed = True, representation = repr, SSSPCache = 2)
+            n0, n1, n2, n3, n4 = Base.Node(), Base.Node(), Base.Node(), Base.Node(), Base.Node()
+            G.add(n0, n1, 5)
+            G.add(n1, n2, 5)
+            G.add(n0, n3, 20)
+            self.assertEqual(G.distances(n0)[0], {n0: 0, n1: 5, n2: 10, n3: 20})
+            G.distances(n1)
+            #shortcut improves n2 and everything behind it
+            G.add(n2, n3, 1)
+            G.add(n0, n2, 2)
+            G.add(n3, n4, 1)
+            dist, prev = G.distances(n0)
+            self.assertEqual(dist, {n0: 0, n1: 5, n2: 2, n3: 3, n4: 4})
+            self.assertEqual(prev[n3], n2)
+            self.assertEqual(G.distances(n1)[0], {n1: 0, n2: 5, n3: 6, n4: 7})
+            self.assertEqual(sum(edge.weight() for edge in G.SSSP(n0).edges()), 9)
+            #least recently used source is evicted
+            G.distances(n2)
+            self.assertEqual(list(G._ssspTrees), [n0, n2])
+            #returned maps are copies
+            G.distances(n2)[0][n4] = 100
+            self.assertEqual(G.distances(n2)[0][n4], 2)
+
+    def test_slots(self):
+        n1, n2 = Base.Node(), Base.Node()
+        for obj in (n1, Base.Neighbour(n1), Base.WeightedNeighbour(n1, 1), Base.Edge(n1, n2), Base.WeightedEdge(n1, n2, 1)):
+            self.assertEqual(hasattr(obj, '__dict__'), False)
+
+    def test_compactNode(self):
+        for weighted in (False, True):
+            n1, n2, n3, n4 = Base.CompactNode(), Base.CompactNode(), Base.CompactNode(), Base.CompactNode()
+            G = Base.Graph(weighted = weighted, representation = Base.Graph.NEIGHBOUR, traversal = Base.Graph.BFS)
+            G.add(n1, n2, 1 if weighted else None)
+            G.add(n2, n3, 2.5 if weighted else None)
+            G.add(n3, n1, 4 if weighted else None)
+            G.add(n3, n4, 1 if weighted else None)
+            G.add(n2, n1, 9 if weighted else None)
+            self.assertEqual(G.numEdges(), 4)
+            self.assertEqual(G.getNeighbourhood(n3), [n2, n1, n4])
+            self.assertEqual(G.search(n4, n1), True)
+            if weighted:
+                self.assertEqual([neighbour.weight() for neighbour in n3.neighbours()], [2.5, 4, 1])
+                self.assertEqual(G.edge(n1, n2).weight(), 1)
+            self.assertEqual(G.DOTprint().count("--"), 4)
+
+            #an existing edge gives an equal but new Neighbour object
+            e1 = G.add(n1, n2, 7 if weighted else None)
+            e2 = G.add(n1, n2, 7 if weighted else None)
+            self.assertIsNot(e1, e2)
+            self.assertIs(e1.opposite(), n2)
+            self.assertIs(e2.opposite(), n2)
+            if weighted:
+                self.assertEqual((e1.weight(), e2.weight()), (1, 1))
+            self.assertEqual(G.numEdges(), 4)
+            self.assertEqual(G.getNeighbourhood(n1), n1.opposites())
+            self.assertEqual(n4.neighbour(n2), None)
+
+        #mixed, huge and bool weights print like with Node
+        graphs = []
+        for nodeType in (Base.Node, Base.CompactNode):
+            n1, n2, n3, n4 = nodeType(), nodeType(), nodeType(), nodeType()
+            G = Base.Graph(weighted = True, representation = Base.Graph.NEIGHBOUR)
+            G.add(n1, n2, 4)
+            G.add(n2, n3, 0.5)
+            G.add(n3, n4, 2 ** 70)
+            G.add(n4, n1, True)
+            graphs.append(G)
+        self.assertEqual(graphs[1].DOTprint(), graphs[0].DOTprint())
+        self.assertIn('label = "4" ]', graphs[1].DOTprint())
+
+    def test_snapshot(self):
+        n0, n1, n2, n3 = Base.Node(), Base.Node(), Base.Node(), Base.Node()
+        G = Base.Graph(directed = True, weighted = True, SSSP = True, traversal = Base.Graph.BFS)
+        G.addEdges([(n0, n1, 1), (n1, n2, 2), (n0, n2, 5), (n2, n3, 1), (n3, n3, 7)])
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'graph.gpl')
+            G.save(path)
+            for mmap in (True, False):
+                H = Base.Graph.load(path, mmap = mmap)
+                self.assertEqual(H.representation(), Base.Graph.CSR if mmap else Base.Graph.EDGE)
+                self.assertEqual((H.directed(), H.weighted(), H.traversal()), (True, True, Base.Graph.BFS))
+                self.assertEqual(H.DOTprint(), G.freeze().DOTprint() if mmap else G.DOTprint())
+                nodes = H.nodes()
+                self.assertEqual(H.distances(nodes[0])[0], {nodes[0]: 0, nodes[1]: 1, nodes[2]: 3, nodes[3]: 4})
+                self.assertEqual(H.search(nodes[3], nodes[0]), False)
+            del H
+
+            #edge representation keeps the insertion order and the direction of undirected edges
+            E = Base.Graph()
+            E.addEdges([(n3, n1), (n1, n2), (n0, n2), (n2, n2)])
+            E.save(path)
+            H = Base.Graph.load(path, mmap = False)
+            self.assertEqual(H.representation(), Base.Graph.EDGE)
+            self.assertEqual(H.DOTprint(), E.DOTprint())
+            self.assertEqual(Base.Graph.load(path).DOTprint(), E.freeze().DOTprint())
+            del H
+
+            #undirected mixed int and float weights in neighbour representation
+            F = Base.Graph(weighted = True, representation = Base.Graph.NEIGHBOUR)
+            F.addEdges([(n0, n1, 0.5), (n2, n1, 4)])
+            F.save(path)
+            for mmap in (True, False):
+                H = Base.Graph.load(path, mmap = mmap)
+                self.assertEqual(H.representation(), Base.Graph.CSR if mmap else Base.Graph.NEIGHBOUR)
+                self.assertEqual(H.DOTprint(), F.freeze().DOTprint() if mmap else F.DOTprint())
+                self.assertIn('label = "4" ]', H.DOTprint())
+            del H
+
+            with open(path, 'wb') as f:
+                f.write(b'not a graph')
+            self.assertRaises(Base.GraphException, Base.Graph.load, path)
+
+    def test_fromEdgeList(self):
+        text = "# comment\na b 1\nb c 2.5\n\nc a 4\na b 1\nd c 0\n"
+        labels = dict()
+        G = Base.Graph.fromEdgeList(io.StringIO(text), weighted = True, labels = labels, traversal = Base.Graph.BFS)
+        self.assertEqual(sorted(labels), ['a', 'b', 'c', 'd'])
+        self.assertEqual(G.nodes(), [labels['a'], labels['b'], labels['c'], labels['d']])
+        self.assertEqual(G.numEdges(), 4)
+        self.assertEqual(G.edge(labels['b'], labels['c']).weight(), 2.5)
+        self.assertEqual(G.edge(labels['c'], labels['a']).weight(), 4)
+        self.assertEqual(G.search(labels['d'], labels['a']), True)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'edges.csv.gz')
+            with gzip.open(path, 'wt') as f:
+                f.write("1,2\n2,3\n3,1\n")
+            for workers in (1, 2):
+                G = Base.Graph.fromEdgeList(path, directed = True, representation = Base.Graph.CSR, delimiter = ',', workers = workers)
+                self.assertEqual(G.representation(), Base.Graph.CSR)
+                self.assertEqual(G.DOTprint(), "digraph g{\nnode[label=\"\"]; \n0 -> 1\n1 -> 2\n2 -> 0\n}")
+
+        self.assertRaises(Base.GraphException, Base.Graph.fromEdgeList, io.StringIO("a b\n"), weighted = True)
+        self.assertRaises(Base.GraphException, Base.Graph.fromEdgeList, io.StringIO("a b x\n"), weighted = True)
+
+    def test_convert(self):
+        for directed in (False, True):
+            nodes = [Base.CompactNode() for i in range(5)]
+            G = Base.Graph(directed = directed, weighted = True, traversal = Base.Graph.BFS)
+            G.addEdges([(nodes[3], nodes[1], 2), (nodes[1], nodes[2], 5), (nodes[0], nodes[3], 1), (nodes[4], nodes[0], 7)])
+            H = G.toRepresentation(Base.Graph.NEIGHBOUR)
+            self.assertEqual(H.representation(), Base.Graph.NEIGHBOUR)
+            self.assertEqual(H.nodes(), G.nodes())
+            self.assertEqual(H.DOTprint().splitlines()[2:], G.freeze().DOTprint().splitlines()[2:])
+            self.assertEqual(H.edge(nodes[1], nodes[2]).weight(), 5)
+            #the nodes already carry the neighbours of H
+            self.assertRaises(Base.GraphException, G.convert, Base.Graph.NEIGHBOUR)
+
+            H.convert(Base.Graph.EDGE)
+            self.assertEqual(H.representation(), Base.Graph.EDGE)
+            self.assertEqual([node.neighbours() for node in nodes], [[], [], [], [], []])
+            G.convert(Base.Graph.NEIGHBOUR)
+            self.assertEqual(G.numEdges(), 4)
+            self.assertEqual(G.search(nodes[3], nodes[2]), True)
+            G.convert(Base.Graph.CSR)
+            G.convert(Base.Graph.EDGE)
+            self.assertEqual(G.freeze().DOTprint(), H.freeze().DOTprint())
+            self.assertEqual(G.toRepresentation(Base.Graph.EDGE).DOTprint(), G.DOTprint())
+
+    @unittest.skipIf(np is None, 'NumPy not installed')
+    def test_levels(self):
+        n0, n1, n2, n3, n4 = Base.Node(), Base.Node(), Base.Node(), Base.Node(), Base.Node()
+        G = Base.Graph(directed = True, weighted = True, traversal = Base.Graph.FRONTIER)
+        G.addEdges([(n0, n1, 3), (n1, n2, 1), (n0, n2, 2), (n2, n3, 4), (n4, n0, 1)])
+        indptr, indices, data = G.adjacencyMatrix()
+        self.assertEqual(indptr.tolist(), [0, 2, 3, 4, 4, 5])
+        self.assertEqual(indices.tolist(), [1, 2, 2, 3, 0])
+        self.assertEqual(data.tolist(), [3, 2, 1, 4, 1])
+        self.assertEqual(G.levels(n0).tolist(), [0, 1, 1, 2, -1])
+        self.assertEqual(G.levels([n1, n4]).tolist(), [1, 0, 1, 2, 0])
+        self.assertEqual(G.search(n0, n3), True)
+        self.assertEqual(G.search(n3, n0), False)
+        #the cached matrix is rebuilt after add
+        G.add(n3, n4, 1)
+        self.assertEqual(G.levels(n3).tolist(), [2, 3, 3, 0, 1])
+        self.assertEqual(G.search(n3, n0), True)
+        self.assertEqual(G.freeze().levels(n3).tolist(), [2, 3, 3, 0, 1])
+
+        U = Base.Graph(representation = Base.Graph.NEIGHBOUR)
+        U.addEdges([(n0, n1), (n1, n2)])
+        U.add(n3, n3)
+        self.assertEqual(U.levels(n2).tolist(), [2, 1, 0, -1])
+        self.assertRaises(Base.GraphException, U.levels, n4)
+
+    @unittest.skipIf(np is None, 'NumPy not installed')
+    def test_vectorizedSSSP(self):
+        n0, n1, n2, n3, n4 = Base.Node(), Base.Node(), Base.Node(), Base.Node(), Base.Node()
+        G = Base.Graph(weighted = True, SSSP = True, directed = True)
+        G.addEdges([(n0, n1, 4), (n0, n2, 1), (n2, n1, 2), (n1, n3, 1), (n3, n1, 0), (n4, n0, 1)])
+        T = G.SSSP(n0, engine = "vectorized")
+        self.assertEqual(T.DOTprint(), G.SSSP(n0).DOTprint())
+        self.assertEqual([(edge.node1(), edge.node2()) for edge in T.edges()], [(n2, n1), (n0, n2), (n1, n3)])
+        self.assertEqual(G.SSSPMany([n0, n3], engine = "vectorized"), G.SSSPMany([n0, n3], workers = 1))
+        dist = G.SSSPMany([n0, n3], matrix = True, engine = "vectorized")
+        self.assertEqual(dist.tolist(), [[0, 3, 1, 4, math.inf], [math.inf, 0, math.inf, 0, math.inf]])
+        self.assertRaises(Base.GraphException, G.SSSP, n0, engine = "unknown")
+
+    def test_observer(self):
+        n0, n1, n2, n3 = Base.Node(), Base.Node(), Base.Node(), Base.Node()
+        G = Base.Graph(directed = True, weighted = True, SSSP = True, traversal = Base.Graph.BFS)
+        stats = Base.Stats()
+        G.setObserver(stats)
+        self.assertEqual(G.addEdges([(n0, n1, 1), (n1, n2, 1), (n0, n2, 5), (n2, n3, 1)]), 4)
+        self.assertEqual(stats.counters('addEdges'), {'inserted': 4})
+        G.distances(n0)
+        self.assertEqual(stats.calls('distances'), 1)
+        counters = stats.counters('distances')
+        self.assertEqual(counters['nodesExpanded'], 4)
+        self.assertEqual(counters['edgesScanned'], 4)
+        self.assertEqual(counters['edgesRelaxed'], 4)
+        self.assertEqual(counters['heapPushes'], counters['heapPops'])
+        self.assertEqual(G.search(n0, n3), True)
+        self.assertEqual(stats.counters('search')['found'], 1)
+        G.getNeighbourhood(n0)
+        G.edge(n3, n0)
+        self.assertEqual(stats.counters('getNeighbourhood'), {'neighbours': 2})
+        self.assertEqual(stats.counters('edge'), {'found': 0})
+        self.assertGreaterEqual(stats.seconds('distances'), 0)
+
+        #callables work as observer too, None disables it
+        calls = []
+        G.setObserver(lambda operation, counters, seconds: calls.append(operation))
+        G.SSSP(n0)
+        G.setObserver(None)
+        G.SSSP(n0)
+        self.assertEqual(calls, ['SSSP'])
+
+        M = Base.Graph(weighted = True, MST = True)
+        M.setObserver(stats)
+        M.addEdges([(n0, n1, 1), (n1, n2, 2), (n0, n2, 3)])
+        M.MST("kruskal")
+        self.assertEqual(stats.counters('MST'), {'edgesSorted': 3, 'treeEdges': 2})
+        M.MST("prim")
+        self.assertEqual(stats.counters('MST')['heapPushes'], stats.counters('MST')['heapPops'])
+
+        #without observer the results stay the same and nothing is reported
+        M.setObserver(None)
+        G.setObserver(None)
+        stats.reset()
+        self.assertEqual(M.MST("prim").DOTprint(), M.MST("kruskal").DOTprint())
+        self.assertEqual(G.distances(n0)[0], {n0: 0, n1: 1, n2: 2, n3: 3})
+        self.assertEqual(G.SSSPMany([n0], workers = 1), {n0: {n0: 0, n1: 1, n2: 2, n3: 3}})
+        self.assertEqual(stats.operations(), [])
+        stats.reset()
+        self.assertEqual(stats.operations(), [])
+
       # ---------------%<------------------
       # End of my tests
       #    